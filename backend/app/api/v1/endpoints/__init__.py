@@ -1 +1 @@
-from app.api.v1.endpoints import auth, detection, zones, alerts
\ No newline at end of file
+from app.api.v1.endpoints import auth, detection, zones, alerts, admin, analytics
\ No newline at end of file
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from app.core.cache import get_cache
+from app.core.security import get_current_admin
+from app.core.profiling import list_profiles, get_profile, render_profile, loop_stalls
+from app.models import User
+
+router = APIRouter()
+
+
+@router.get("/profiles")
+async def get_profiles(current_user: User = Depends(get_current_admin)):
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("html", pattern="^(html|text|speedscope)$"),
+    current_user: User = Depends(get_current_admin)
+):
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="ไม่พบโปรไฟล์")
+    
+    content = render_profile(profile, format)
+    filename = f"profile-{profile_id}.{'json' if format == 'speedscope' else format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    if format == "html":
+        return HTMLResponse(content, headers=headers)
+    if format == "speedscope":
+        return Response(content, media_type="application/json", headers=headers)
+    return PlainTextResponse(content, headers=headers)
+
+
+@router.get("/loop-stalls")
+async def get_loop_stalls(current_user: User = Depends(get_current_admin)):
+    return list(reversed(loop_stalls))
+
+
+@router.get("/cache")
+async def get_cache_stats(current_user: User = Depends(get_current_admin)):
+    return get_cache().stats()
\ No newline at end of file
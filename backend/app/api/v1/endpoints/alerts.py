@@ -1,23 +1,28 @@
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models import User, Alert
-from app.schemas import AlertResponse, AlertResolve
+from app.schemas import AlertResponse, AlertResolve, AlertBulkFilter, AlertBulkResolve, AlertBulkResult, AlertGroup
+from app.services import AlertService
+from app.api.v1.fieldsets import parse_fields
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_class=ORJSONResponse)
 async def get_alerts(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    columns = parse_fields(fields, AlertResponse)
     query = db.query(Alert)
     
     if status:
@@ -25,14 +30,70 @@ async def get_alerts(
     
     total = query.count()
     skip = (page - 1) * per_page
-    alerts = query.order_by(Alert.created_at.desc()).offset(skip).limit(per_page).all()
+    query = query.order_by(Alert.created_at.desc()).offset(skip).limit(per_page)
     
-    return {
-        "items": [AlertResponse.model_validate(a) for a in alerts],
+    if columns is None:
+        items = [AlertResponse.model_validate(a).model_dump() for a in query.all()]
+    else:
+        items = [row._asdict() for row in query.with_entities(*[getattr(Alert, c) for c in columns]).all()]
+    
+    return ORJSONResponse({
+        "items": items,
         "total": total,
         "page": page,
         "per_page": per_page
-    }
+    })
+
+
+@router.get("/grouped", response_model=List[AlertGroup])
+async def get_grouped_alerts(
+    bucket: str = Query("hour", pattern="^(hour|day|month)$"),
+    status: Optional[str] = Query(None),
+    zone_id: Optional[int] = Query(None),
+    alert_type: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    alert_filter = AlertBulkFilter(
+        status=status,
+        zone_id=zone_id,
+        alert_type=alert_type,
+        created_from=created_from,
+        created_to=created_to
+    )
+    service = AlertService(db)
+    return service.get_grouped(alert_filter, bucket=bucket, limit=limit)
+
+
+def _require_filter(alert_filter: AlertBulkFilter):
+    if alert_filter.is_empty():
+        raise HTTPException(status_code=400, detail="ต้องระบุรายการหรือเงื่อนไขอย่างน้อยหนึ่งอย่าง")
+
+
+@router.post("/bulk/acknowledge", response_model=AlertBulkResult)
+async def bulk_acknowledge_alerts(
+    alert_filter: AlertBulkFilter,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _require_filter(alert_filter)
+    service = AlertService(db)
+    return {"updated": service.bulk_acknowledge(alert_filter, current_user.id)}
+
+
+@router.post("/bulk/resolve", response_model=AlertBulkResult)
+async def bulk_resolve_alerts(
+    resolve_data: AlertBulkResolve,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    alert_filter = AlertBulkFilter(**resolve_data.model_dump(exclude={"resolution_note"}))
+    _require_filter(alert_filter)
+    service = AlertService(db)
+    return {"updated": service.bulk_resolve(alert_filter, current_user.id, resolve_data.resolution_note)}
 
 
 @router.put("/{alert_id}/acknowledge", response_model=AlertResponse)
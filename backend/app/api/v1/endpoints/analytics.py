@@ -0,0 +1,94 @@
+from typing import Optional, List
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.security import get_current_user, get_current_admin
+from app.models import User
+from app.schemas import TimeSeriesPoint, HeatmapResponse
+from app.services import AnalyticsService
+from app.services.analytics_service import backfill_lock, iter_export, run_backfill
+
+router = APIRouter()
+
+
+@router.get("/timeseries", response_model=List[TimeSeriesPoint])
+async def get_timeseries(
+    bucket: str = Query("hour", pattern="^(hour|day|month)$"),
+    zone_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    class_id: Optional[List[int]] = Query(None),
+    violations_only: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = AnalyticsService(db)
+    return service.get_timeseries(
+        bucket=bucket,
+        zone_id=zone_id,
+        start=start,
+        end=end,
+        class_ids=class_id,
+        violations_only=violations_only
+    )
+
+
+@router.get("/heatmap", response_model=HeatmapResponse)
+async def get_heatmap(
+    cell_size: int = Query(64, ge=8, le=1024),
+    zone_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    class_id: Optional[List[int]] = Query(None),
+    violations_only: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = AnalyticsService(db)
+    return service.get_heatmap(
+        cell_size=cell_size,
+        zone_id=zone_id,
+        start=start,
+        end=end,
+        class_ids=class_id,
+        violations_only=violations_only
+    )
+
+
+@router.get("/export")
+async def export_objects(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    zone_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    class_id: Optional[List[int]] = Query(None),
+    violations_only: bool = Query(False),
+    current_user: User = Depends(get_current_user)
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_export(
+            fmt=format,
+            zone_id=zone_id,
+            start=start,
+            end=end,
+            class_ids=class_id,
+            violations_only=violations_only
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="detections.{format}"'}
+    )
+
+
+@router.post("/backfill", status_code=status.HTTP_202_ACCEPTED)
+async def backfill_objects(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin)
+):
+    if backfill_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="กำลังเติมข้อมูลย้อนหลังอยู่")
+    # runs in the threadpool after the response; large tables take minutes
+    background_tasks.add_task(run_backfill)
+    return {"status": "started"}
\ No newline at end of file
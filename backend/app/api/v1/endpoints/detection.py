@@ -1,20 +1,46 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from typing import Optional, List
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.cache import cached_json_response
 from app.core.database import get_db
+from app.core.storage import get_storage, parse_range
 from app.core.security import get_current_user
 from app.models import User, Detection
-from app.schemas import DetectionResponse, DetectionStats
+from app.schemas import DetectionResponse, DetectionSummary, DetectionStats, IngestRecord, IngestResult
+from app.api.v1.fieldsets import parse_fields
+from app.ml.adaptive import get_adaptive_controller
+from app.ml.motion_gate import get_motion_gate
 from app.services import DetectionService
 
 router = APIRouter()
 
+ingest_adapter = TypeAdapter(List[IngestRecord])
+
+
+def _parse_ingest_body(body: bytes, content_type: str) -> Optional[list]:
+    if content_type == "application/msgpack":
+        import msgpack
+        
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(body)
+        items = list(unpacker)
+        if len(items) == 1 and isinstance(items[0], list):
+            return items[0]
+        return items
+    if content_type in ("application/x-ndjson", "application/jsonl"):
+        return [orjson.loads(line) for line in body.splitlines() if line.strip()]
+    return None
+
 
 @router.post("/image", response_model=DetectionResponse)
 async def detect_from_image(
     file: UploadFile = File(...),
     zone_id: Optional[int] = Query(None),
+    camera_id: Optional[str] = Query(None, max_length=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -30,7 +56,8 @@ async def detect_from_image(
         detection = await service.process_image(
             file=file,
             user_id=current_user.id,
-            zone_id=zone_id
+            zone_id=zone_id,
+            camera_id=camera_id
         )
         return detection
     except Exception as e:
@@ -40,15 +67,95 @@ async def detect_from_image(
         )
 
 
-@router.get("/history")
+@router.post("/ingest", response_model=IngestResult)
+async def ingest_detections(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="ข้อมูลมีขนาดใหญ่เกินไป"
+    )
+    try:
+        content_length = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Content-Length ไม่ถูกต้อง"
+        )
+    if content_length > settings.INGEST_MAX_BYTES:
+        raise too_large
+    
+    # chunked requests have no Content-Length, so the limit is also enforced while reading
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.INGEST_MAX_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    body = b"".join(chunks)
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        raw_records = _parse_ingest_body(body, content_type)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="รูปแบบข้อมูลไม่ถูกต้อง"
+        )
+    
+    if raw_records is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="รองรับเฉพาะ application/x-ndjson หรือ application/msgpack"
+        )
+    
+    if len(raw_records) > settings.INGEST_MAX_RECORDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"ส่งได้ไม่เกิน {settings.INGEST_MAX_RECORDS} รายการต่อครั้ง"
+        )
+    
+    try:
+        records = ingest_adapter.validate_python(raw_records)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[{"loc": err["loc"], "msg": err["msg"], "type": err["type"]} for err in e.errors()]
+        )
+    
+    if not records:
+        return {"accepted": 0, "ids": []}
+    
+    service = DetectionService(db)
+    unknown = service.find_unknown_zones(records)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[
+                {"loc": [index, "zone_id"], "msg": f"ไม่พบโซน {zone_id}", "type": "unknown_zone"}
+                for index, zone_id in unknown
+            ]
+        )
+    ids = await service.ingest_records(records, user_id=current_user.id)
+    return {"accepted": len(ids), "ids": ids}
+
+
+@router.get("/history", response_class=ORJSONResponse)
 async def get_detection_history(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     zone_id: Optional[int] = Query(None),
     has_violation: Optional[bool] = Query(None),
+    include_objects: bool = Query(True),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    default_fields = None if include_objects else list(DetectionSummary.model_fields)
+    columns = parse_fields(fields, DetectionResponse, default_fields)
+    
     service = DetectionService(db)
     
     skip = (page - 1) * per_page
@@ -56,49 +163,77 @@ async def get_detection_history(
         skip=skip,
         limit=per_page,
         zone_id=zone_id,
-        has_violation=has_violation
+        has_violation=has_violation,
+        columns=columns
     )
     
-    return {
-        "items": [DetectionResponse.model_validate(d) for d in detections],
+    if columns is None:
+        items = [DetectionResponse.model_validate(d).model_dump() for d in detections]
+    else:
+        items = detections
+    
+    return ORJSONResponse({
+        "items": items,
         "total": total,
         "page": page,
         "per_page": per_page,
         "total_pages": (total + per_page - 1) // per_page
-    }
+    })
 
 
 @router.get("/stats", response_model=DetectionStats)
 async def get_detection_stats(
+    request: Request,
     zone_id: Optional[int] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     service = DetectionService(db)
-    return service.get_stats(zone_id=zone_id)
+    return cached_json_response(
+        request,
+        "stats",
+        str(zone_id),
+        lambda: service.get_stats(zone_id=zone_id)
+    )
+
+
+@router.get("/gate/stats")
+async def get_motion_gate_stats(current_user: User = Depends(get_current_user)):
+    if not settings.MOTION_GATE_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_motion_gate().stats()}
+
+
+@router.get("/adaptive/stats")
+async def get_adaptive_stats(current_user: User = Depends(get_current_user)):
+    return get_adaptive_controller().stats()
 
 
 @router.get("/{detection_id}", response_model=DetectionResponse)
 async def get_detection(
     detection_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     service = DetectionService(db)
-    detection = service.get_detection(detection_id)
     
-    if detection is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ไม่พบข้อมูล"
-        )
+    def load_detection():
+        detection = service.get_detection(detection_id)
+        if detection is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="ไม่พบข้อมูล"
+            )
+        return DetectionResponse.model_validate(detection).model_dump()
     
-    return detection
+    return cached_json_response(request, "detection", str(detection_id), load_detection)
 
 
 @router.get("/{detection_id}/image/result")
 async def get_result_image(
     detection_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     detection = db.query(Detection).filter(Detection.id == detection_id).first()
@@ -109,4 +244,45 @@ async def get_result_image(
             detail="ไม่พบรูปภาพ"
         )
     
-    return FileResponse(detection.result_image_path)
\ No newline at end of file
+    storage = get_storage()
+    key = detection.result_image_path
+    
+    url = storage.presigned_url(key)
+    if url is not None:
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    
+    try:
+        size = await storage.size(key)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ไม่พบรูปภาพ"
+        )
+    
+    headers = {"Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="ช่วงข้อมูลไม่ถูกต้อง",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            storage.stream(key),
+            media_type=storage.content_type(key),
+            headers=headers
+        )
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        storage.stream(key, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=storage.content_type(key),
+        headers=headers
+    )
\ No newline at end of file
@@ -1,21 +1,27 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from app.core.cache import cached_json_response, invalidate_cache
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models import User, Zone
-from app.schemas import ZoneResponse, ZoneCreate, ZoneUpdate
+from app.ml.detector import PPEDetector
+from app.models import User, Zone, InferenceProfile
+from app.schemas import ZoneResponse, ZoneCreate, ZoneUpdate, InferenceProfileUpdate, InferenceProfileResponse
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ZoneResponse])
 async def get_zones(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    zones = db.query(Zone).filter(Zone.is_active == True).all()
-    return zones
+    def load_zones():
+        zones = db.query(Zone).filter(Zone.is_active == True).all()
+        return [ZoneResponse.model_validate(z).model_dump() for z in zones]
+    
+    return cached_json_response(request, "zones", "active", load_zones)
 
 
 @router.post("/", response_model=ZoneResponse)
@@ -28,19 +34,24 @@ async def create_zone(
     db.add(zone)
     db.commit()
     db.refresh(zone)
+    invalidate_cache("zones")
     return zone
 
 
 @router.get("/{zone_id}", response_model=ZoneResponse)
 async def get_zone(
     zone_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    zone = db.query(Zone).filter(Zone.id == zone_id).first()
-    if zone is None:
-        raise HTTPException(status_code=404, detail="ไม่พบโซน")
-    return zone
+    def load_zone():
+        zone = db.query(Zone).filter(Zone.id == zone_id).first()
+        if zone is None:
+            raise HTTPException(status_code=404, detail="ไม่พบโซน")
+        return ZoneResponse.model_validate(zone).model_dump()
+    
+    return cached_json_response(request, "zones", str(zone_id), load_zone)
 
 
 @router.put("/{zone_id}", response_model=ZoneResponse)
@@ -60,9 +71,55 @@ async def update_zone(
     
     db.commit()
     db.refresh(zone)
+    invalidate_cache("zones")
     return zone
 
 
+@router.get("/{zone_id}/profile", response_model=InferenceProfileResponse)
+async def get_inference_profile(
+    zone_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    def load_profile():
+        if db.query(Zone.id).filter(Zone.id == zone_id).first() is None:
+            raise HTTPException(status_code=404, detail="ไม่พบโซน")
+        profile = db.query(InferenceProfile).filter(InferenceProfile.zone_id == zone_id).first()
+        if profile is None:
+            return InferenceProfileResponse(zone_id=zone_id).model_dump()
+        return InferenceProfileResponse.model_validate(profile).model_dump()
+    
+    return cached_json_response(request, "zones", f"{zone_id}:profile", load_profile)
+
+
+@router.put("/{zone_id}/profile", response_model=InferenceProfileResponse)
+async def update_inference_profile(
+    zone_id: int,
+    profile_data: InferenceProfileUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if db.query(Zone.id).filter(Zone.id == zone_id).first() is None:
+        raise HTTPException(status_code=404, detail="ไม่พบโซน")
+    
+    unknown = set(profile_data.enabled_classes or []) - set(PPEDetector.CLASS_NAMES.values())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"ไม่รู้จักคลาส: {', '.join(sorted(unknown))}")
+    
+    profile = db.query(InferenceProfile).filter(InferenceProfile.zone_id == zone_id).first()
+    if profile is None:
+        profile = InferenceProfile(zone_id=zone_id)
+        db.add(profile)
+    for field, value in profile_data.model_dump().items():
+        setattr(profile, field, value)
+    
+    db.commit()
+    db.refresh(profile)
+    invalidate_cache("zones")
+    return profile
+
+
 @router.delete("/{zone_id}")
 async def delete_zone(
     zone_id: int,
@@ -75,4 +132,5 @@ async def delete_zone(
     
     zone.is_active = False
     db.commit()
+    invalidate_cache("zones")
     return {"message": "ลบโซนเรียบร้อย"}
\ No newline at end of file
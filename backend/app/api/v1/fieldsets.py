@@ -0,0 +1,20 @@
+from typing import List, Optional, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel], default: Optional[List[str]] = None) -> Optional[List[str]]:
+    if not fields:
+        return default
+    
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ไม่รู้จักฟิลด์: {', '.join(unknown)}"
+        )
+    
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return list(dict.fromkeys(requested))
\ No newline at end of file
@@ -1,9 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, detection, zones, alerts
+from app.api.v1.endpoints import auth, detection, zones, alerts, admin, analytics
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(detection.router, prefix="/detection", tags=["Detection"])
 api_router.include_router(zones.router, prefix="/zones", tags=["Zones"])
-api_router.include_router(alerts.router, prefix="/alerts", tags=["Alerts"])
\ No newline at end of file
+api_router.include_router(alerts.router, prefix="/alerts", tags=["Alerts"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
@@ -0,0 +1,126 @@
+import argparse
+import json
+import logging
+from app.core.config import settings
+
+
+def invalidate_api_cache(*namespaces: str):
+    # only a shared Redis cache can be invalidated from this process; the memory backend
+    # lives inside each API worker and is bounded by its TTL alone
+    if settings.CACHE_BACKEND == "redis":
+        from app.core.cache import invalidate_cache
+
+        invalidate_cache(*namespaces)
+    else:
+        print(
+            f"API workers keep serving cached {', '.join(namespaces)} responses for up to "
+            f"{settings.CACHE_TTL_SECONDS}s (CACHE_BACKEND=memory)"
+        )
+
+
+def rescore(args):
+    from app.core.storage import get_storage
+    from app.ml.detector import PPEDetector
+    from app.services.rescore_service import RescoreJob
+
+    detector = PPEDetector(model_path=args.model_path)
+    if args.confidence is not None:
+        detector.confidence_threshold = args.confidence
+
+    job = RescoreJob(
+        detector=detector,
+        storage=get_storage(),
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        readers=args.readers,
+        prefetch_batches=args.prefetch,
+        max_images_per_second=args.max_rate,
+        zone_id=args.zone_id
+    )
+    report = job.run()
+    invalidate_api_cache("stats", "detection")
+
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(text)
+    print(text)
+
+
+def backfill_objects(args):
+    from app.services.analytics_service import run_backfill
+
+    total = run_backfill()
+    print(f"Backfilled detection_objects for {total} detections")
+    invalidate_api_cache("stats")
+
+
+def migrate(args):
+    import app.models  # noqa: F401 - registers the tables with Base.metadata
+    from app.core.database import init_db
+    from app.core.migrations import upgrade_schema
+
+    init_db()
+    applied = upgrade_schema()
+    print(f"Applied: {', '.join(applied) or 'schema is up to date'}")
+
+
+def partitions(args):
+    import app.models  # noqa: F401 - registers the tables with Base.metadata
+    from app.core import partitioning
+
+    if not partitioning.PARTITIONED:
+        print("Partitioning is only available on PostgreSQL with PARTITIONING_ENABLED=true")
+        return
+
+    if args.action == "migrate":
+        tables = partitioning.migrate_to_partitioned()
+        print(f"Migrated: {', '.join(tables) or 'nothing to migrate'}")
+        for table in tables:
+            print(f"Previous rows kept in {table}_legacy; drop it once the migration is verified")
+    elif args.action == "archive":
+        files = partitioning.archive_partitions(args.older_than_months, args.archive_dir)
+        print("\n".join(files) if files else "No partitions old enough to archive")
+    else:
+        created = partitioning.ensure_partitions(months_ahead=args.months_ahead)
+        print(f"Created: {', '.join(created) or 'all partitions already exist'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rescore_parser = subparsers.add_parser("rescore", help="Re-run stored images through a new model")
+    rescore_parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    rescore_parser.add_argument("--confidence", type=float)
+    rescore_parser.add_argument("--checkpoint", default="rescore_checkpoint.json")
+    rescore_parser.add_argument("--report", help="Write the violation diff report to this file")
+    rescore_parser.add_argument("--batch-size", type=int, default=16)
+    rescore_parser.add_argument("--readers", type=int, default=4)
+    rescore_parser.add_argument("--prefetch", type=int, default=2, help="Batches to read ahead of inference")
+    rescore_parser.add_argument("--max-rate", type=float, default=0.0, help="Images per second, 0 for unlimited")
+    rescore_parser.add_argument("--zone-id", type=int)
+    rescore_parser.set_defaults(func=rescore)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-objects", help="Fill detection_objects for detections stored before the table existed"
+    )
+    backfill_parser.set_defaults(func=backfill_objects)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Create missing tables and add new columns to existing ones")
+    migrate_parser.set_defaults(func=migrate)
+
+    partitions_parser = subparsers.add_parser("partitions", help="Manage monthly partitions of detections and alerts")
+    partitions_parser.add_argument("action", choices=["ensure", "migrate", "archive"])
+    partitions_parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    partitions_parser.add_argument("--older-than-months", type=int, default=settings.PARTITION_RETENTION_MONTHS)
+    partitions_parser.add_argument("--archive-dir", default=settings.ARCHIVE_DIR)
+    partitions_parser.set_defaults(func=partitions)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+import orjson
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+
+class CacheBackend:
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def bump_generation(self, namespace: str):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisCache(CacheBackend):
+    def __init__(self, url: str, prefix: str = "ppe:cache:", generation_ttl: float = 1.0):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.generation_ttl = generation_ttl
+        self._generations: Dict[str, Tuple[float, int]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    def generation(self, namespace: str) -> int:
+        # the entry key depends on the generation, so the two reads cannot share a round trip;
+        # remembering the generation briefly keeps a cached GET to a single blocking call
+        cached = self._generations.get(namespace)
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+        generation = int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+        self._generations[namespace] = (monotonic() + self.generation_ttl, generation)
+        return generation
+
+    def bump_generation(self, namespace: str):
+        generation = self.client.incr(f"{self.prefix}gen:{namespace}")
+        self._generations[namespace] = (monotonic() + self.generation_ttl, generation)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:{self.backend.generation(namespace)}:{key}"
+
+    def get(self, namespace: str, key: str) -> Tuple[str, Optional[Tuple[str, bytes]]]:
+        full_key = self._key(namespace, key)
+        value = self.backend.get(full_key)
+        counter = self.misses if value is None else self.hits
+        counter[namespace] = counter.get(namespace, 0) + 1
+        CACHE_REQUESTS.labels(namespace, "miss" if value is None else "hit").inc()
+        if value is None:
+            return full_key, None
+        etag, _, body = value.partition(b"\n")
+        return full_key, (etag.decode(), body)
+
+    def set(self, full_key: str, etag: str, body: bytes):
+        self.backend.set(full_key, etag.encode() + b"\n" + body, self.ttl)
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self.backend.bump_generation(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        namespaces = set(self.hits) | set(self.misses)
+        result = {}
+        for namespace in sorted(namespaces):
+            hits = self.hits.get(namespace, 0)
+            misses = self.misses.get(namespace, 0)
+            result[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0
+            }
+        return result
+
+
+@lru_cache()
+def get_cache() -> ResponseCache:
+    if settings.CACHE_BACKEND == "redis":
+        backend = RedisCache(settings.CACHE_REDIS_URL, generation_ttl=settings.CACHE_GENERATION_TTL_SECONDS)
+    else:
+        backend = MemoryCache(settings.CACHE_MAX_ENTRIES)
+    return ResponseCache(backend, settings.CACHE_TTL_SECONDS)
+
+
+# With the memory backend this only reaches the current process; other gunicorn workers
+# and API workers after a CLI job rely on CACHE_TTL_SECONDS to pick up changes
+def invalidate_cache(*namespaces: str):
+    get_cache().invalidate(*namespaces)
+
+
+def cached_json_response(
+    request: Request,
+    namespace: str,
+    key: str,
+    producer: Callable[[], Any]
+) -> Response:
+    cache = get_cache()
+    full_key, entry = cache.get(namespace, key)
+    if entry is None:
+        payload = producer()
+        body = orjson.dumps(jsonable_encoder(payload))
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        cache.set(full_key, etag, body)
+    else:
+        etag, body = entry
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
\ No newline at end of file
@@ -0,0 +1,24 @@
+import re
+from typing import Iterable
+from brotli_asgi import BrotliMiddleware
+
+
+class SelectiveCompressionMiddleware:
+    # Images are already compressed, and a 206 body's Content-Range describes the
+    # uncompressed bytes, so those responses bypass the Brotli/gzip encoder
+    def __init__(self, app, excluded_paths: Iterable[str] = (), **options):
+        self.app = app
+        self.compressed_app = BrotliMiddleware(app, **options)
+        self.excluded_paths = [re.compile(pattern) for pattern in excluded_paths]
+
+    def _skip(self, scope) -> bool:
+        path = scope["path"]
+        if any(pattern.search(path) for pattern in self.excluded_paths):
+            return True
+        return any(name == b"range" for name, _ in scope["headers"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not self._skip(scope):
+            await self.compressed_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -14,12 +15,78 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
+    COMPRESSION_MIN_SIZE: int = 1024
+    
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_GENERATION_TTL_SECONDS: float = 1.0
     
     MODEL_PATH: str = "./app/ml/models/ppe_yolov8n.pt"
     CONFIDENCE_THRESHOLD: float = 0.5
     
+    WEB_CONCURRENCY: int = 1
+    TORCH_NUM_THREADS: int = 0
+    TORCH_INTEROP_THREADS: int = 1
+    
+    INFERENCE_INPUT_SIZE: int = 640
+    INFERENCE_IOU_THRESHOLD: float = 0.7
+    INFERENCE_MAX_DETECTIONS: int = 300
+    REDUCED_DECODE_ENABLED: bool = True
+    REDUCED_RESULT_IMAGE: bool = False
+    ADAPTIVE_INPUT_SIZES: str = "1280,960,640,512,416,320"
+    ADAPTIVE_SMOOTHING: float = 0.2
+    ADAPTIVE_RECOVER_RATIO: float = 0.6
+    ADAPTIVE_COOLDOWN_FRAMES: int = 10
+    ADAPTIVE_MAX_KEYS: int = 1024
+    
+    MOTION_GATE_ENABLED: bool = False
+    MOTION_GATE_WIDTH: int = 160
+    MOTION_GATE_PIXEL_DELTA: int = 25
+    MOTION_GATE_CHANGED_RATIO: float = 0.01
+    MOTION_GATE_REFRESH_SECONDS: float = 10.0
+    MOTION_GATE_MAX_CAMERAS: int = 1024
+    
+    WRITE_BEHIND_ENABLED: bool = False
+    WRITE_BEHIND_MAX_ROWS: int = 100
+    WRITE_BEHIND_FLUSH_MS: float = 50.0
+    
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 10485760
+    
+    INGEST_MAX_RECORDS: int = 5000
+    INGEST_MAX_BYTES: int = 52428800
+
+    PARTITIONING_ENABLED: bool = True
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_HOURS: float = 12.0
+    PARTITION_RETENTION_MONTHS: int = 12
+    ARCHIVE_DIR: str = "./archive"
+
+    STORAGE_BACKEND: str = "local"
+    S3_BUCKET: str = "ppe-detection"
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_PUBLIC_ENDPOINT_URL: Optional[str] = None
+    S3_ACCESS_KEY: Optional[str] = None
+    S3_SECRET_KEY: Optional[str] = None
+    S3_REGION: str = "us-east-1"
+    S3_CREATE_BUCKET: bool = False
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_MULTIPART_THRESHOLD: int = 8388608
+    S3_MULTIPART_CHUNKSIZE: int = 8388608
+    S3_MAX_CONCURRENCY: int = 4
+    S3_PRESIGNED_REDIRECT: bool = True
+    S3_PRESIGNED_EXPIRE_SECONDS: int = 3600
+
+    METRICS_ENABLED: bool = False
+
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_BUFFER_SIZE: int = 50
+    LOOP_LAG_THRESHOLD_MS: float = 0.0
+    LOOP_LAG_CHECK_INTERVAL_MS: float = 50.0
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,18 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+SCHEMA_LOCK_KEY = 7310001
+
 
 def get_db():
     db = SessionLocal()
@@ -19,4 +23,13 @@ def get_db():
 
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    # every gunicorn worker calls this at startup; the lock stops them racing on CREATE TABLE
+    with engine.begin() as conn:
+        advisory_lock(conn, SCHEMA_LOCK_KEY)
+        Base.metadata.create_all(bind=conn)
+
+
+def advisory_lock(conn, key: int):
+    # serializes schema changes between workers that start at the same time; released on commit
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
\ No newline at end of file
@@ -0,0 +1,143 @@
+import os
+from contextlib import nullcontext
+from time import perf_counter
+from fastapi import Request, Response
+from prometheus_client import multiprocess, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily
+from app.core.config import settings
+
+registry = CollectorRegistry()
+
+STAGES = (
+    "upload_read",
+    "disk_write",
+    "decode",
+    "model_forward",
+    "post_process",
+    "draw",
+    "encode_write",
+    "db_insert",
+    "alert_insert"
+)
+
+STAGE_DURATION = Histogram(
+    "ppe_stage_duration_seconds",
+    "Duration of each stage of the image detection path",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    registry=registry
+)
+
+HTTP_REQUESTS = Counter(
+    "ppe_http_requests_total",
+    "HTTP requests by endpoint",
+    ["method", "endpoint", "status"],
+    registry=registry
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "ppe_http_request_duration_seconds",
+    "HTTP request latency by endpoint",
+    ["method", "endpoint"],
+    registry=registry
+)
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "ppe_inference_queue_depth",
+    "Image detection requests currently decoding, running or waiting for the model",
+    registry=registry
+)
+
+MOTION_GATE_FRAMES = Counter(
+    "ppe_motion_gate_frames_total",
+    "Frames seen by the motion gate, by whether inference ran or was skipped",
+    ["result"],
+    registry=registry
+)
+
+CACHE_REQUESTS = Counter(
+    "ppe_cache_requests_total",
+    "Response cache lookups by namespace and result",
+    ["namespace", "result"],
+    registry=registry
+)
+
+MODEL_LOAD_SECONDS = Gauge(
+    "ppe_model_load_seconds",
+    "Time taken to load the detection model",
+    registry=registry
+)
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(perf_counter() - self.start)
+        return False
+
+
+_noop = nullcontext()
+_stage_histograms = {stage: STAGE_DURATION.labels(stage) for stage in STAGES}
+
+
+def track_stage(stage: str):
+    if not settings.METRICS_ENABLED:
+        return _noop
+    return _StageTimer(_stage_histograms[stage])
+
+
+def track_inference_queue():
+    if not settings.METRICS_ENABLED:
+        return _noop
+    return INFERENCE_QUEUE_DEPTH.track_inprogress()
+
+
+class DatabasePoolCollector:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return
+        for name, value, description in (
+            ("ppe_db_pool_size", pool.size(), "Configured size of the connection pool"),
+            ("ppe_db_pool_checked_in", pool.checkedin(), "Idle connections in the pool"),
+            ("ppe_db_pool_checked_out", pool.checkedout(), "Connections currently in use"),
+            ("ppe_db_pool_overflow", pool.overflow(), "Connections opened beyond the pool size")
+        ):
+            yield GaugeMetricFamily(name, description, value=value)
+
+
+def register_database_pool(engine):
+    registry.register(DatabasePoolCollector(engine))
+
+
+async def metrics_middleware(request: Request, call_next):
+    start = perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.labels(request.method, endpoint, str(status_code)).inc()
+        HTTP_REQUEST_DURATION.labels(request.method, endpoint).observe(perf_counter() - start)
+
+
+def metrics_response() -> Response:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        scrape_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(scrape_registry)
+        return Response(generate_latest(scrape_registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
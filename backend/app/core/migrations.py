@@ -0,0 +1,35 @@
+import logging
+from typing import List
+from sqlalchemy import inspect, text
+from app.core.database import engine, advisory_lock, SCHEMA_LOCK_KEY
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema() -> List[str]:
+    # create_all only creates missing tables; columns added to existing tables are applied here
+    applied = []
+    with engine.begin() as conn:
+        advisory_lock(conn, SCHEMA_LOCK_KEY)
+        inspector = inspect(conn)
+        if not inspector.has_table("detections"):
+            return applied
+        
+        columns = {c["name"]: c for c in inspector.get_columns("detections")}
+        if "camera_id" not in columns:
+            conn.execute(text("ALTER TABLE detections ADD COLUMN camera_id VARCHAR(100)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_detections_camera_id ON detections (camera_id)"))
+            applied.append("detections.camera_id")
+        if not columns["original_image_path"]["nullable"]:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("ALTER TABLE detections ALTER COLUMN original_image_path DROP NOT NULL"))
+                applied.append("detections.original_image_path nullable")
+            else:
+                logger.warning(
+                    "detections.original_image_path is NOT NULL; ingest records without a thumbnail "
+                    "need the table recreated on %s", conn.dialect.name
+                )
+    
+    for change in applied:
+        logger.info("Applied schema change %s", change)
+    return applied
\ No newline at end of file
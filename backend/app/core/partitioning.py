@@ -0,0 +1,234 @@
+import asyncio
+import gzip
+import logging
+from datetime import date
+from pathlib import Path
+from typing import List, Tuple
+from sqlalchemy import ForeignKey, inspect, text
+from app.core.config import settings
+from app.core.database import engine, advisory_lock
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED = settings.PARTITIONING_ENABLED and engine.dialect.name == "postgresql"
+
+PARTITIONED_TABLES = ("detections", "detection_objects", "alerts")
+
+PARTITION_LOCK_KEY = 7310002
+
+
+def partition_table_args() -> dict:
+    return {"postgresql_partition_by": "RANGE (created_at)"} if PARTITIONED else {}
+
+
+def detection_fk() -> tuple:
+    # Postgres cannot reference detections.id alone once the key is (id, created_at)
+    return () if PARTITIONED else (ForeignKey("detections.id"),)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year}{month.month:02d}"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"
+    ), {"table": table}).first() is not None
+
+
+def list_partitions(conn, table: str) -> List[Tuple[str, date]]:
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table"
+    ), {"table": table}).scalars()
+    partitions = []
+    prefix = f"{table}_p"
+    for name in rows:
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def default_partition_months(conn, table: str) -> List[date]:
+    rows = conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {table}_default"
+    )).scalars()
+    return sorted(rows)
+
+
+def create_partition(conn, table: str, month: date) -> bool:
+    name = partition_name(table, month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    in_default = conn.execute(text(
+        f"SELECT 1 FROM {table}_default WHERE created_at >= :start AND created_at < :end LIMIT 1"
+    ), {"start": start, "end": end}).first() is not None
+    if not in_default:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+        return True
+
+    # Postgres refuses a new partition while DEFAULT holds rows for its range, e.g. late
+    # ingests with an old captured_at, so move those rows into it before attaching
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = conn.execute(text(
+        f"WITH moved AS (DELETE FROM {table}_default WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), {"start": start, "end": end}).rowcount
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+    logger.info("Moved %s rows from %s_default into %s", moved, table, name)
+    return True
+
+
+def _ensure_table_partitions(conn, table: str, start: date, last: date) -> List[str]:
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+    existing = {name for name, _ in list_partitions(conn, table)}
+    months = set(default_partition_months(conn, table))
+    month = start
+    while month <= last:
+        months.add(month)
+        month = add_months(month, 1)
+
+    created = []
+    for month in sorted(months):
+        name = partition_name(table, month)
+        if name not in existing and create_partition(conn, table, month):
+            created.append(name)
+    return created
+
+
+def ensure_partitions(start: date = None, months_ahead: int = None) -> List[str]:
+    if not PARTITIONED:
+        return []
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = date.today().replace(day=1)
+    start = (start or add_months(current, -1)).replace(day=1)
+
+    created = []
+    with engine.begin() as conn:
+        # every gunicorn worker runs this at startup and on the maintenance schedule
+        advisory_lock(conn, PARTITION_LOCK_KEY)
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(conn, table):
+                created.extend(_ensure_table_partitions(conn, table, start, add_months(current, months_ahead)))
+    return created
+
+
+def check_partitioning():
+    if not PARTITIONED:
+        return
+    with engine.connect() as conn:
+        legacy = [t for t in PARTITIONED_TABLES if not is_partitioned(conn, t)]
+    if legacy:
+        logger.warning(
+            "Tables %s are not partitioned; run 'python -m app.cli partitions migrate' to convert them",
+            ", ".join(legacy)
+        )
+
+
+def migrate_to_partitioned() -> List[str]:
+    if not PARTITIONED:
+        return []
+    from app.core.database import Base
+
+    migrated = []
+    with engine.begin() as conn:
+        advisory_lock(conn, PARTITION_LOCK_KEY)
+        legacy_tables = [t for t in PARTITIONED_TABLES if not is_partitioned(conn, t)]
+        for table in legacy_tables:
+            legacy = f"{table}_legacy"
+            indexes = conn.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+            ), {"table": table}).scalars().all()
+            conn.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+            conn.execute(text(f"ALTER SEQUENCE IF EXISTS {table}_id_seq RENAME TO {legacy}_id_seq"))
+            for index in indexes:
+                conn.execute(text(f"ALTER INDEX {index} RENAME TO {index}_legacy"))
+
+        Base.metadata.create_all(
+            bind=conn,
+            tables=[Base.metadata.tables[t] for t in legacy_tables]
+        )
+
+        for table in legacy_tables:
+            legacy = f"{table}_legacy"
+            oldest = conn.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+            _ensure_table_partitions(
+                conn,
+                table,
+                (oldest.date() if oldest else date.today()).replace(day=1),
+                add_months(date.today().replace(day=1), settings.PARTITION_MONTHS_AHEAD)
+            )
+
+            legacy_columns = {c["name"] for c in inspect(conn).get_columns(legacy)}
+            columns = [c.name for c in Base.metadata.tables[table].columns if c.name in legacy_columns]
+            select_columns = ["coalesce(created_at, now())" if c == "created_at" else c for c in columns]
+            conn.execute(text(
+                f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(select_columns)} FROM {legacy}"
+            ))
+            conn.execute(text(
+                f"SELECT setval('{table}_id_seq', coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+            ))
+            migrated.append(table)
+    return migrated
+
+
+def archive_partitions(older_than_months: int = None, archive_dir: str = None) -> List[str]:
+    if not PARTITIONED:
+        return []
+    older_than_months = settings.PARTITION_RETENTION_MONTHS if older_than_months is None else older_than_months
+    archive_path = Path(archive_dir or settings.ARCHIVE_DIR)
+    archive_path.mkdir(parents=True, exist_ok=True)
+    cutoff = add_months(date.today().replace(day=1), -older_than_months)
+
+    archived = []
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as conn:
+            if not is_partitioned(conn, table):
+                continue
+            partitions = [name for name, month in list_partitions(conn, table) if add_months(month, 1) <= cutoff]
+
+        for name in partitions:
+            # export, detach and drop in one transaction: if the export fails the partition
+            # stays attached and is picked up again by the next run
+            target = archive_path / f"{name}.csv.gz"
+            partial = target.with_suffix(".gz.partial")
+            raw = engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (PARTITION_LOCK_KEY,))
+                cursor.execute(f"LOCK TABLE {name} IN SHARE MODE")
+                with gzip.open(partial, "wb") as f:
+                    cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", f)
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                cursor.execute(f"DROP TABLE {name}")
+                partial.replace(target)
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                partial.unlink(missing_ok=True)
+                raise
+            finally:
+                raw.close()
+            logger.info("Archived %s to %s", name, target)
+            archived.append(str(target))
+    return archived
+
+
+async def maintain_partitions(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            created = await asyncio.to_thread(ensure_partitions)
+            if created:
+                logger.info("Created partitions %s", ", ".join(created))
+        except Exception:
+            logger.exception("Partition maintenance failed")
@@ -0,0 +1,139 @@
+import asyncio
+import hmac
+import logging
+import random
+import sys
+import threading
+import traceback
+import uuid
+from collections import deque
+from datetime import datetime
+from time import monotonic, perf_counter
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+profiles = deque(maxlen=settings.PROFILING_BUFFER_SIZE)
+loop_stalls = deque(maxlen=settings.PROFILING_BUFFER_SIZE)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> bool:
+        if settings.PROFILING_TOKEN:
+            token = _header(scope, b"x-profile")
+            if token is not None and hmac.compare_digest(token.encode("latin-1"), settings.PROFILING_TOKEN.encode()):
+                return True
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+        started_at = datetime.utcnow()
+        start = perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            profiles.append({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "started_at": started_at,
+                "duration_ms": round((perf_counter() - start) * 1000, 2),
+                "session": session
+            })
+
+
+def list_profiles() -> List[Dict]:
+    return [{k: v for k, v in p.items() if k != "session"} for p in reversed(profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[Dict]:
+    for profile in profiles:
+        if profile["id"] == profile_id:
+            return profile
+    return None
+
+
+def render_profile(profile: Dict, fmt: str) -> str:
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+    renderers = {
+        "html": HTMLRenderer,
+        "text": lambda: ConsoleRenderer(unicode=True, color=False),
+        "speedscope": SpeedscopeRenderer
+    }
+    return renderers[fmt]().render(profile["session"])
+
+
+class LoopLagMonitor:
+    def __init__(self, threshold_ms: float, interval_ms: float):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.last_beat = monotonic()
+        self.loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self.last_beat = monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stopped.wait(self.interval):
+            beat = self.last_beat
+            lag = monotonic() - beat - self.interval
+            if lag < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            loop_stalls.append({
+                "detected_at": datetime.utcnow(),
+                "lag_ms": round(lag * 1000, 2),
+                "stack": stack
+            })
+            logger.warning("Event loop blocked for %.0f ms\n%s", lag * 1000, stack)
+
+    def start(self):
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
\ No newline at end of file
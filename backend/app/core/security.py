@@ -55,4 +55,13 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_current_admin(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="ต้องเป็นผู้ดูแลระบบเท่านั้น"
+        )
+    return current_user
\ No newline at end of file
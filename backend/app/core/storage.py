@@ -0,0 +1,209 @@
+import asyncio
+import io
+import mimetypes
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+import aiofiles
+from app.core.config import settings
+
+
+class StorageBackend:
+    chunk_size = 1024 * 1024
+
+    async def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    async def read(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    async def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def stream(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    def presigned_url(self, key: str) -> Optional[str]:
+        return None
+
+    def read_sync(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    @staticmethod
+    def content_type(key: str) -> str:
+        return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        path = self.root / key
+        # Rows written before the storage layer hold a path relative to the working directory
+        if not path.exists() and Path(key).exists():
+            return Path(key)
+        return path
+
+    async def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        async with aiofiles.open(self.root / key, "wb") as f:
+            await f.write(data)
+        return key
+
+    async def read(self, key: str) -> bytes:
+        async with aiofiles.open(self.path(key), "rb") as f:
+            return await f.read()
+
+    def read_sync(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    async def size(self, key: str) -> int:
+        return self.path(key).stat().st_size
+
+    async def stream(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        remaining = None if end is None else end - start + 1
+        async with aiofiles.open(self.path(key), "rb") as f:
+            await f.seek(start)
+            while remaining is None or remaining > 0:
+                n = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                data = await f.read(n)
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+
+
+class S3Storage(StorageBackend):
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None
+    ):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        config = Config(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+            s3={"addressing_style": "path"}
+        )
+        client_kwargs = {
+            "aws_access_key_id": access_key,
+            "aws_secret_access_key": secret_key,
+            "region_name": region,
+            "config": config
+        }
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_kwargs)
+        if public_endpoint_url and public_endpoint_url != endpoint_url:
+            self.presign_client = boto3.client("s3", endpoint_url=public_endpoint_url, **client_kwargs)
+        else:
+            self.presign_client = self.client
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+            use_threads=True
+        )
+
+    def ensure_bucket(self):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError:
+            self.client.create_bucket(Bucket=self.bucket)
+
+    async def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        await asyncio.to_thread(
+            self.client.upload_fileobj,
+            io.BytesIO(data),
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type or self.content_type(key)},
+            Config=self.transfer_config
+        )
+        return key
+
+    def read_sync(self, key: str) -> bytes:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise FileNotFoundError(key) from e
+        return response["Body"].read()
+
+    async def read(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.read_sync, key)
+
+    async def size(self, key: str) -> int:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise FileNotFoundError(key) from e
+        return response["ContentLength"]
+
+    async def stream(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-" if end is None else f"bytes={start}-{end}"
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=key, Range=byte_range
+        )
+        body = response["Body"]
+        try:
+            while True:
+                data = await asyncio.to_thread(body.read, self.chunk_size)
+                if not data:
+                    break
+                yield data
+        finally:
+            body.close()
+
+    def presigned_url(self, key: str) -> Optional[str]:
+        if not settings.S3_PRESIGNED_REDIRECT:
+            return None
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=settings.S3_PRESIGNED_EXPIRE_SECONDS
+        )
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_str, _, end_str = header[len("bytes="):].strip().partition("-")
+    if start_str == "":
+        if not end_str.isdigit() or int(end_str) == 0:
+            raise ValueError(header)
+        return max(size - int(end_str), 0), size - 1
+    if not start_str.isdigit() or (end_str and not end_str.isdigit()):
+        raise ValueError(header)
+    start = int(start_str)
+    end = min(int(end_str), size - 1) if end_str else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+@lru_cache()
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION
+        )
+    return LocalStorage(settings.UPLOAD_DIR)
\ No newline at end of file
@@ -1,9 +1,19 @@
+import asyncio
+import re
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.compression import SelectiveCompressionMiddleware
+from app.core.database import init_db, engine
+from app.core.migrations import upgrade_schema
+from app.core.partitioning import PARTITIONED, check_partitioning, ensure_partitions, maintain_partitions
+from app.core.profiling import ProfilingMiddleware, LoopLagMonitor
+from app.core.metrics import metrics_middleware, metrics_response, register_database_pool
+from app.core.storage import get_storage, S3Storage
+from app.ml.runtime import configure_threads
+from app.services.write_behind import get_write_behind, stop_write_behind
 from app.api.v1.router import api_router
 
 app = FastAPI(
@@ -22,16 +32,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    SelectiveCompressionMiddleware,
+    excluded_paths=[
+        rf"^{re.escape(settings.API_V1_PREFIX)}/detection/\d+/image/",
+        r"^/uploads/"
+    ],
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_fallback=True
+)
+
+app.add_middleware(ProfilingMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.middleware("http")(metrics_middleware)
+    register_database_pool(engine)
+
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
-uploads_path = Path(settings.UPLOAD_DIR)
-uploads_path.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(uploads_path)), name="uploads")
+if settings.STORAGE_BACKEND == "local":
+    uploads_path = Path(settings.UPLOAD_DIR)
+    uploads_path.mkdir(parents=True, exist_ok=True)
+    app.mount("/uploads", StaticFiles(directory=str(uploads_path)), name="uploads")
 
 
 @app.on_event("startup")
 async def startup():
     init_db()
+    upgrade_schema()
+    if PARTITIONED:
+        ensure_partitions()
+        check_partitioning()
+        app.state.partition_task = asyncio.create_task(
+            maintain_partitions(settings.PARTITION_MAINTENANCE_INTERVAL_HOURS * 3600)
+        )
+    if settings.TORCH_NUM_THREADS > 0:
+        configure_threads()
+    get_write_behind()
+    storage = get_storage()
+    if isinstance(storage, S3Storage) and settings.S3_CREATE_BUCKET:
+        storage.ensure_bucket()
+    if settings.LOOP_LAG_THRESHOLD_MS > 0:
+        app.state.loop_lag_monitor = LoopLagMonitor(
+            settings.LOOP_LAG_THRESHOLD_MS,
+            settings.LOOP_LAG_CHECK_INTERVAL_MS
+        )
+        app.state.loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    stop_write_behind()
+    partition_task = getattr(app.state, "partition_task", None)
+    if partition_task is not None:
+        partition_task.cancel()
+    monitor = getattr(app.state, "loop_lag_monitor", None)
+    if monitor is not None:
+        monitor.stop()
 
 
 @app.get("/")
@@ -43,6 +100,12 @@ async def root():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return metrics_response()
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
\ No newline at end of file
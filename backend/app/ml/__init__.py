@@ -1 +1,3 @@
-from app.ml.detector import PPEDetector, get_detector
\ No newline at end of file
+from app.ml.detector import PPEDetector, get_detector
+from app.ml.motion_gate import MotionGate, get_motion_gate
+from app.ml.adaptive import AdaptiveController, InferenceParams, get_adaptive_controller
\ No newline at end of file
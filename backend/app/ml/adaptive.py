@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.ml.detector import PPEDetector
+
+
+class InferenceParams:
+    __slots__ = (
+        "input_size", "min_input_size", "conf", "iou", "max_det",
+        "classes", "latency_budget_ms", "max_frame_skip"
+    )
+
+    def __init__(self, profile=None):
+        def pick(name: str, default):
+            value = getattr(profile, name, None)
+            return default if value is None else value
+
+        self.input_size = pick("input_size", settings.INFERENCE_INPUT_SIZE)
+        self.min_input_size = min(pick("min_input_size", self.input_size), self.input_size)
+        self.conf = pick("confidence_threshold", settings.CONFIDENCE_THRESHOLD)
+        self.iou = pick("iou_threshold", settings.INFERENCE_IOU_THRESHOLD)
+        self.max_det = pick("max_detections", settings.INFERENCE_MAX_DETECTIONS)
+        self.classes = PPEDetector.class_ids(pick("enabled_classes", None))
+        self.latency_budget_ms = pick("latency_budget_ms", None)
+        self.max_frame_skip = pick("max_frame_skip", 0)
+
+    def detect_kwargs(self, imgsz: int) -> Dict[str, Any]:
+        return {
+            "imgsz": imgsz,
+            "conf": self.conf,
+            "iou": self.iou,
+            "max_det": self.max_det,
+            "classes": self.classes
+        }
+
+
+class _AdaptiveState:
+    __slots__ = ("latency_ms", "level", "input_size", "frame_skip", "frames", "skipped", "since_change", "result")
+
+    def __init__(self):
+        self.latency_ms = None
+        self.level = 0
+        self.input_size = None
+        self.frame_skip = 0
+        self.frames = 0
+        self.skipped = 0
+        self.since_change = 0
+        self.result = None
+
+
+class AdaptiveController:
+    def __init__(
+        self,
+        sizes: Tuple[int, ...] = (1280, 960, 640, 512, 416, 320),
+        smoothing: float = 0.2,
+        recover_ratio: float = 0.6,
+        cooldown_frames: int = 10,
+        max_keys: int = 1024
+    ):
+        self.sizes = tuple(sorted(sizes, reverse=True))
+        self.smoothing = smoothing
+        self.recover_ratio = recover_ratio
+        self.cooldown_frames = cooldown_frames
+        self.max_keys = max_keys
+        self.states: "OrderedDict[str, _AdaptiveState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ladder(self, params: InferenceParams) -> List[int]:
+        return [params.input_size] + [
+            size for size in self.sizes if params.min_input_size <= size < params.input_size
+        ]
+
+    def _state(self, key: str) -> _AdaptiveState:
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = _AdaptiveState()
+            if len(self.states) > self.max_keys:
+                self.states.popitem(last=False)
+        else:
+            self.states.move_to_end(key)
+        return state
+
+    def plan(self, key: str, params: InferenceParams) -> Tuple[int, Optional[Dict[str, Any]]]:
+        ladder = self.ladder(params)
+        with self._lock:
+            state = self._state(key)
+            state.level = min(state.level, len(ladder) - 1)
+            state.frame_skip = min(state.frame_skip, params.max_frame_skip)
+            state.input_size = ladder[state.level]
+            state.frames += 1
+            if state.frame_skip and state.result is not None and state.frames % (state.frame_skip + 1):
+                state.skipped += 1
+                return state.input_size, state.result
+            return state.input_size, None
+
+    def record(self, key: str, params: InferenceParams, latency_ms: float, result: Dict[str, Any]):
+        ladder = self.ladder(params)
+        with self._lock:
+            state = self._state(key)
+            state.result = result
+            if state.latency_ms is None:
+                state.latency_ms = latency_ms
+            else:
+                state.latency_ms += self.smoothing * (latency_ms - state.latency_ms)
+            state.since_change += 1
+
+            budget = params.latency_budget_ms
+            if budget is None or state.since_change < self.cooldown_frames:
+                return
+            if state.latency_ms > budget:
+                if state.level < len(ladder) - 1:
+                    state.level += 1
+                elif state.frame_skip < params.max_frame_skip:
+                    state.frame_skip += 1
+                else:
+                    return
+            elif state.latency_ms < budget * self.recover_ratio:
+                if state.frame_skip > 0:
+                    state.frame_skip -= 1
+                elif state.level > 0:
+                    state.level -= 1
+                else:
+                    return
+            else:
+                return
+            state.since_change = 0
+            # the average was measured at the old setting, start fresh at the new one
+            state.latency_ms = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                key: {
+                    "input_size": state.input_size,
+                    "frame_skip": state.frame_skip,
+                    "latency_ms": round(state.latency_ms, 2) if state.latency_ms is not None else None,
+                    "frames": state.frames,
+                    "skipped": state.skipped
+                }
+                for key, state in self.states.items()
+            }
+
+
+adaptive_controller = None
+
+def get_adaptive_controller() -> AdaptiveController:
+    global adaptive_controller
+    if adaptive_controller is None:
+        adaptive_controller = AdaptiveController(
+            sizes=tuple(int(size) for size in settings.ADAPTIVE_INPUT_SIZES.split(",") if size.strip()),
+            smoothing=settings.ADAPTIVE_SMOOTHING,
+            recover_ratio=settings.ADAPTIVE_RECOVER_RATIO,
+            cooldown_frames=settings.ADAPTIVE_COOLDOWN_FRAMES,
+            max_keys=settings.ADAPTIVE_MAX_KEYS
+        )
+    return adaptive_controller
\ No newline at end of file
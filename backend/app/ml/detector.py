@@ -1,10 +1,13 @@
+import io
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from PIL import Image
 from ultralytics import YOLO
-import time
+from time import perf_counter
 from app.core.config import settings
+from app.core.metrics import track_stage, MODEL_LOAD_SECONDS
 
 
 class PPEDetector:
@@ -23,6 +26,12 @@ class PPEDetector:
     
     VIOLATION_CLASSES = ["no_hardhat", "no_mask", "no_safety_vest"]
     
+    REDUCED_DECODE_FLAGS = (
+        (8, cv2.IMREAD_REDUCED_COLOR_8),
+        (4, cv2.IMREAD_REDUCED_COLOR_4),
+        (2, cv2.IMREAD_REDUCED_COLOR_2)
+    )
+    
     COLORS = {
         "person": (255, 165, 0),
         "hardhat": (0, 255, 0),
@@ -43,6 +52,7 @@ class PPEDetector:
         self._load_model()
 
     def _load_model(self):
+        start_time = perf_counter()
         try:
             if Path(self.model_path).exists():
                 self.model = YOLO(self.model_path)
@@ -54,9 +64,30 @@ class PPEDetector:
             print(f"Error loading model: {e}")
             print("Running without model...")
             self.model = None
+        MODEL_LOAD_SECONDS.set(perf_counter() - start_time)
+
+    def warmup(self, width: int = 640, height: int = 640, runs: int = 2):
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        for _ in range(runs):
+            self.detect(image)
+
+    @classmethod
+    def class_ids(cls, class_names: Optional[List[str]]) -> Optional[List[int]]:
+        if class_names is None:
+            return None
+        return [cls_id for cls_id, name in cls.CLASS_NAMES.items() if name in class_names]
 
-    def detect(self, image: np.ndarray) -> Dict[str, Any]:
-        start_time = time.time()
+    def detect(
+        self,
+        image: np.ndarray,
+        imgsz: Optional[int] = None,
+        conf: Optional[float] = None,
+        iou: Optional[float] = None,
+        max_det: Optional[int] = None,
+        classes: Optional[List[int]] = None,
+        scale: float = 1.0
+    ) -> Dict[str, Any]:
+        start_time = perf_counter()
         
         if self.model is None:
             return {
@@ -68,59 +99,100 @@ class PPEDetector:
                 "processing_time_ms": 0
             }
         
-        results = self.model(
-            image,
-            conf=self.confidence_threshold,
-            verbose=False
-        )
+        options = {"imgsz": imgsz, "iou": iou, "max_det": max_det, "classes": classes}
+        with track_stage("model_forward"):
+            results = self.model(
+                image,
+                conf=self.confidence_threshold if conf is None else conf,
+                verbose=False,
+                **{key: value for key, value in options.items() if value is not None}
+            )
+        
+        with track_stage("post_process"):
+            summary = self.summarize([
+                obj for result in results for obj in self._parse_boxes(result.boxes, scale)
+            ])
+        
+        processing_time = (perf_counter() - start_time) * 1000
+        summary["processing_time_ms"] = round(processing_time, 2)
+        return summary
+
+    def detect_batch(
+        self,
+        images: List[np.ndarray],
+        imgsz: Optional[int] = None,
+        conf: Optional[float] = None,
+        iou: Optional[float] = None,
+        max_det: Optional[int] = None,
+        classes: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        if self.model is None or not images:
+            return [self.detect(image) for image in images]
+        
+        start_time = perf_counter()
+        options = {"imgsz": imgsz, "iou": iou, "max_det": max_det, "classes": classes}
+        with track_stage("model_forward"):
+            results = self.model(
+                images,
+                conf=self.confidence_threshold if conf is None else conf,
+                verbose=False,
+                **{key: value for key, value in options.items() if value is not None}
+            )
         
-        detected_objects = []
+        with track_stage("post_process"):
+            summaries = [self.summarize(self._parse_boxes(result.boxes)) for result in results]
+        
+        processing_time = (perf_counter() - start_time) * 1000 / len(images)
+        for summary in summaries:
+            summary["processing_time_ms"] = round(processing_time, 2)
+        return summaries
+
+    @classmethod
+    def build_object(cls, cls_id: int, confidence: float, bbox: List[float]) -> Dict[str, Any]:
+        class_name = cls.CLASS_NAMES.get(cls_id, f"class_{cls_id}")
+        return {
+            "class_id": cls_id,
+            "class_name": class_name,
+            "confidence": round(confidence, 4),
+            "bbox": [round(x, 2) for x in bbox],
+            "is_violation": class_name in cls.VIOLATION_CLASSES
+        }
+
+    def _parse_boxes(self, boxes, scale: float = 1.0) -> List[Dict[str, Any]]:
+        if boxes is None:
+            return []
+        return [
+            self.build_object(int(box.cls[0]), float(box.conf[0]), [x * scale for x in box.xyxy[0].tolist()])
+            for box in boxes
+        ]
+
+    @classmethod
+    def summarize(cls, detected_objects: List[Dict[str, Any]]) -> Dict[str, Any]:
         violations = []
         person_count = 0
         violation_count = 0
         
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    cls_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()
-                    
-                    class_name = self.CLASS_NAMES.get(cls_id, f"class_{cls_id}")
-                    is_violation = class_name in self.VIOLATION_CLASSES
-                    
-                    detected_objects.append({
-                        "class_id": cls_id,
-                        "class_name": class_name,
-                        "confidence": round(confidence, 4),
-                        "bbox": [round(x, 2) for x in bbox],
-                        "is_violation": is_violation
-                    })
-                    
-                    if class_name == "person":
-                        person_count += 1
-                    
-                    if is_violation:
-                        violation_count += 1
-                        violations.append(class_name)
-        
-        processing_time = (time.time() - start_time) * 1000
+        for obj in detected_objects:
+            if obj["class_name"] == "person":
+                person_count += 1
+            
+            if obj["is_violation"]:
+                violation_count += 1
+                violations.append(obj["class_name"])
         
         return {
             "detected_objects": detected_objects,
             "violations": list(set(violations)),
             "person_count": person_count,
             "violation_count": violation_count,
-            "has_violation": violation_count > 0,
-            "processing_time_ms": round(processing_time, 2)
+            "has_violation": violation_count > 0
         }
 
-    def draw_detections(self, image: np.ndarray, detections: List[Dict]) -> np.ndarray:
+    def draw_detections(self, image: np.ndarray, detections: List[Dict], scale: float = 1.0) -> np.ndarray:
         result_image = image.copy()
         
         for det in detections:
-            bbox = det["bbox"]
+            bbox = [x / scale for x in det["bbox"]]
             class_name = det["class_name"]
             confidence = det["confidence"]
             is_violation = det["is_violation"]
@@ -168,6 +240,38 @@ class PPEDetector:
         
         return detection_result
 
+    def decode_image(self, data: bytes) -> np.ndarray:
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Could not decode image")
+        return image
+
+    def decode_image_reduced(self, data: bytes, target_size: int) -> Tuple[np.ndarray, float]:
+        # libjpeg can decode at 1/2, 1/4 or 1/8 scale for free; the returned factor maps
+        # coordinates in the reduced image back to the original
+        if data[:2] != b"\xff\xd8":
+            return self.decode_image(data), 1.0
+        try:
+            width, height = Image.open(io.BytesIO(data)).size
+        except Exception:
+            return self.decode_image(data), 1.0
+        
+        for factor, flag in self.REDUCED_DECODE_FLAGS:
+            if max(width, height) // factor >= target_size:
+                image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+                if image is None:
+                    raise ValueError("Could not decode image")
+                # PIL reports the stored size while imdecode applies EXIF rotation, so compare
+                # long sides, which are the same in either orientation
+                return image, max(width, height) / max(image.shape[:2])
+        return self.decode_image(data), 1.0
+
+    def encode_image(self, image: np.ndarray) -> bytes:
+        success, encoded = cv2.imencode(".jpg", image)
+        if not success:
+            raise ValueError("Could not encode result image")
+        return encoded.tobytes()
+
 
 detector = None
 
@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+import cv2
+import numpy as np
+from app.core.config import settings
+
+
+class _GateState:
+    __slots__ = ("reference", "result", "refreshed_at", "frames", "skipped")
+
+    def __init__(self):
+        self.reference = None
+        self.result = None
+        self.refreshed_at = 0.0
+        self.frames = 0
+        self.skipped = 0
+
+
+class MotionGate:
+    def __init__(
+        self,
+        width: int = 160,
+        pixel_delta: int = 25,
+        changed_ratio: float = 0.01,
+        refresh_seconds: float = 10.0,
+        max_cameras: int = 1024
+    ):
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.changed_ratio = changed_ratio
+        self.refresh_seconds = refresh_seconds
+        self.max_cameras = max_cameras
+        self.states: "OrderedDict[str, _GateState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def thumbnail(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def _state(self, key: str) -> _GateState:
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = _GateState()
+            if len(self.states) > self.max_cameras:
+                self.states.popitem(last=False)
+        else:
+            self.states.move_to_end(key)
+        return state
+
+    def check(self, key: str, image: np.ndarray) -> Tuple[Optional[Dict[str, Any]], np.ndarray]:
+        thumb = self.thumbnail(image)
+        with self._lock:
+            state = self._state(key)
+            state.frames += 1
+            if (
+                state.result is None
+                or state.reference.shape != thumb.shape
+                or monotonic() - state.refreshed_at >= self.refresh_seconds
+            ):
+                return None, thumb
+            changed = np.count_nonzero(cv2.absdiff(thumb, state.reference) > self.pixel_delta)
+            if changed >= self.changed_ratio * thumb.size:
+                return None, thumb
+            state.skipped += 1
+            return state.result, thumb
+
+    def update(self, key: str, thumb: np.ndarray, result: Dict[str, Any]):
+        with self._lock:
+            state = self._state(key)
+            state.reference = thumb
+            state.result = result
+            state.refreshed_at = monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cameras = {
+                key: {
+                    "frames": state.frames,
+                    "skipped": state.skipped,
+                    "skip_ratio": round(state.skipped / state.frames, 4) if state.frames else 0.0
+                }
+                for key, state in self.states.items()
+            }
+        frames = sum(c["frames"] for c in cameras.values())
+        skipped = sum(c["skipped"] for c in cameras.values())
+        return {
+            "frames": frames,
+            "skipped": skipped,
+            "skip_ratio": round(skipped / frames, 4) if frames else 0.0,
+            "cameras": cameras
+        }
+
+
+motion_gate = None
+
+def get_motion_gate() -> MotionGate:
+    global motion_gate
+    if motion_gate is None:
+        motion_gate = MotionGate(
+            width=settings.MOTION_GATE_WIDTH,
+            pixel_delta=settings.MOTION_GATE_PIXEL_DELTA,
+            changed_ratio=settings.MOTION_GATE_CHANGED_RATIO,
+            refresh_seconds=settings.MOTION_GATE_REFRESH_SECONDS,
+            max_cameras=settings.MOTION_GATE_MAX_CAMERAS
+        )
+    return motion_gate
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+from typing import Optional
+import cv2
+from app.core.config import settings
+
+
+def default_thread_count(workers: Optional[int] = None) -> int:
+    workers = workers or settings.WEB_CONCURRENCY
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def configure_threads(num_threads: Optional[int] = None, interop_threads: Optional[int] = None):
+    import torch
+
+    num_threads = num_threads or settings.TORCH_NUM_THREADS or default_thread_count()
+    interop_threads = interop_threads or settings.TORCH_INTEROP_THREADS
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(interop_threads)
+    except RuntimeError:
+        pass
+    cv2.setNumThreads(num_threads)
\ No newline at end of file
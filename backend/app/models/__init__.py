@@ -1,4 +1,6 @@
 from app.models.user import User
 from app.models.zone import Zone
 from app.models.detection import Detection
-from app.models.alert import Alert
\ No newline at end of file
+from app.models.alert import Alert
+from app.models.detection_object import DetectionObject
+from app.models.inference_profile import InferenceProfile
\ No newline at end of file
@@ -1,13 +1,14 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.partitioning import PARTITIONED, detection_fk, partition_table_args
 
 
 class Alert(Base):
     __tablename__ = "alerts"
 
-    id = Column(Integer, primary_key=True, index=True)
-    detection_id = Column(Integer, ForeignKey("detections.id"), nullable=False)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    detection_id = Column(Integer, *detection_fk(), nullable=False, index=True)
     
     alert_type = Column(String(100), nullable=False)
     message = Column(String(500), nullable=True)
@@ -20,4 +21,6 @@ class Alert(Base):
     resolved_at = Column(DateTime(timezone=True), nullable=True)
     resolution_note = Column(Text, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=PARTITIONED, index=True)
+
+    __table_args__ = partition_table_args()
\ No newline at end of file
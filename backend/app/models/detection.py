@@ -1,16 +1,18 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.partitioning import PARTITIONED, partition_table_args
 
 
 class Detection(Base):
     __tablename__ = "detections"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     zone_id = Column(Integer, ForeignKey("zones.id"), nullable=True)
+    camera_id = Column(String(100), nullable=True, index=True)
     
-    original_image_path = Column(String(500), nullable=False)
+    original_image_path = Column(String(500), nullable=True)
     result_image_path = Column(String(500), nullable=True)
     
     detected_objects = Column(JSON, default=list)
@@ -21,4 +23,6 @@ class Detection(Base):
     has_violation = Column(Boolean, default=False)
     processing_time_ms = Column(Float, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=PARTITIONED, index=True)
+
+    __table_args__ = partition_table_args()
\ No newline at end of file
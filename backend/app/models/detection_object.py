@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, SmallInteger, Float, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.core.partitioning import PARTITIONED, detection_fk, partition_table_args
+
+
+class DetectionObject(Base):
+    __tablename__ = "detection_objects"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    detection_id = Column(Integer, *detection_fk(), nullable=False, index=True)
+    zone_id = Column(Integer, ForeignKey("zones.id"), nullable=True)
+    
+    class_id = Column(SmallInteger, nullable=False)
+    confidence = Column(Float, nullable=False)
+    x1 = Column(Float, nullable=False)
+    y1 = Column(Float, nullable=False)
+    x2 = Column(Float, nullable=False)
+    y2 = Column(Float, nullable=False)
+    is_violation = Column(Boolean, default=False, nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=PARTITIONED)
+
+    __table_args__ = (
+        Index("ix_detection_objects_created_zone_class", "created_at", "zone_id", "class_id"),
+        partition_table_args()
+    )
+
+    @classmethod
+    def rows_from_objects(cls, detection_id: int, zone_id, objects, created_at=None) -> list:
+        rows = []
+        for obj in objects:
+            x1, y1, x2, y2 = obj["bbox"]
+            row = {
+                "detection_id": detection_id,
+                "zone_id": zone_id,
+                "class_id": obj["class_id"],
+                "confidence": obj["confidence"],
+                "x1": x1,
+                "y1": y1,
+                "x2": x2,
+                "y2": y2,
+                "is_violation": obj["is_violation"]
+            }
+            if created_at is not None:
+                row["created_at"] = created_at
+            rows.append(row)
+        return rows
\ No newline at end of file
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, DateTime, JSON, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class InferenceProfile(Base):
+    __tablename__ = "inference_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    zone_id = Column(Integer, ForeignKey("zones.id"), nullable=False, unique=True)
+    
+    input_size = Column(Integer, nullable=True)
+    min_input_size = Column(Integer, nullable=True)
+    confidence_threshold = Column(Float, nullable=True)
+    iou_threshold = Column(Float, nullable=True)
+    max_detections = Column(Integer, nullable=True)
+    enabled_classes = Column(JSON, nullable=True)
+    
+    latency_budget_ms = Column(Float, nullable=True)
+    max_frame_skip = Column(Integer, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
@@ -1,4 +1,11 @@
 from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, Token
-from app.schemas.zone import ZoneBase, ZoneCreate, ZoneUpdate, ZoneResponse
-from app.schemas.detection import DetectedObject, DetectionResponse, DetectionStats
-from app.schemas.alert import AlertBase, AlertCreate, AlertResolve, AlertResponse
\ No newline at end of file
+from app.schemas.zone import ZoneBase, ZoneCreate, ZoneUpdate, ZoneResponse, InferenceProfileUpdate, InferenceProfileResponse
+from app.schemas.detection import (
+    DetectedObject, DetectionResponse, DetectionSummary, DetectionStats,
+    IngestObject, IngestRecord, IngestResult
+)
+from app.schemas.alert import (
+    AlertBase, AlertCreate, AlertResolve, AlertResponse,
+    AlertBulkFilter, AlertBulkResolve, AlertBulkResult, AlertGroup
+)
+from app.schemas.analytics import TimeSeriesPoint, HeatmapCell, HeatmapResponse
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -27,4 +27,34 @@ class AlertResponse(AlertBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class AlertBulkFilter(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    zone_id: Optional[int] = None
+    alert_type: Optional[str] = None
+    status: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class AlertBulkResolve(AlertBulkFilter):
+    resolution_note: Optional[str] = None
+
+
+class AlertBulkResult(BaseModel):
+    updated: int
+
+
+class AlertGroup(BaseModel):
+    zone_id: Optional[int] = None
+    alert_type: str
+    bucket: datetime
+    count: int
+    new_count: int
+    first_alert_at: datetime
+    last_alert_at: datetime
\ No newline at end of file
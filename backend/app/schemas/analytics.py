@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class TimeSeriesPoint(BaseModel):
+    bucket: datetime
+    zone_id: Optional[int] = None
+    class_id: int
+    class_name: str
+    count: int
+
+
+class HeatmapCell(BaseModel):
+    x: int
+    y: int
+    count: int
+
+
+class HeatmapResponse(BaseModel):
+    cell_size: int
+    cells: List[HeatmapCell]
\ No newline at end of file
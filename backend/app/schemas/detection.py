@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+import base64
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Any
 from datetime import datetime
 
@@ -13,7 +14,8 @@ class DetectedObject(BaseModel):
 class DetectionResponse(BaseModel):
     id: int
     zone_id: Optional[int] = None
-    original_image_path: str
+    camera_id: Optional[str] = None
+    original_image_path: Optional[str] = None
     result_image_path: Optional[str] = None
     detected_objects: List[Any] = []
     violations: List[str] = []
@@ -27,9 +29,52 @@ class DetectionResponse(BaseModel):
         from_attributes = True
 
 
+class DetectionSummary(BaseModel):
+    id: int
+    zone_id: Optional[int] = None
+    camera_id: Optional[str] = None
+    result_image_path: Optional[str] = None
+    violations: List[str] = []
+    person_count: int = 0
+    violation_count: int = 0
+    has_violation: bool = False
+    processing_time_ms: Optional[float] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class DetectionStats(BaseModel):
     total_detections: int
     total_persons: int
     total_violations: int
     compliance_rate: float
-    violation_by_type: dict
\ No newline at end of file
+    violation_by_type: dict
+
+
+class IngestObject(BaseModel):
+    class_id: int = Field(ge=0, le=32767)
+    confidence: float = Field(ge=0, le=1)
+    bbox: List[float] = Field(min_length=4, max_length=4)
+
+
+class IngestRecord(BaseModel):
+    camera_id: Optional[str] = Field(None, max_length=100)
+    zone_id: Optional[int] = None
+    captured_at: datetime
+    objects: List[IngestObject] = []
+    processing_time_ms: Optional[float] = None
+    thumbnail: Optional[bytes] = None
+
+    @field_validator("thumbnail", mode="before")
+    @classmethod
+    def decode_thumbnail(cls, value):
+        if isinstance(value, str):
+            return base64.b64decode(value, validate=True)
+        return value
+
+
+class IngestResult(BaseModel):
+    accepted: int
+    ids: List[int]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -25,5 +25,24 @@ class ZoneResponse(ZoneBase):
     is_active: bool
     created_at: datetime
 
+    class Config:
+        from_attributes = True
+
+
+class InferenceProfileUpdate(BaseModel):
+    input_size: Optional[int] = Field(None, ge=160, le=1920, multiple_of=32)
+    min_input_size: Optional[int] = Field(None, ge=160, le=1920, multiple_of=32)
+    confidence_threshold: Optional[float] = Field(None, ge=0.0, le=1.0)
+    iou_threshold: Optional[float] = Field(None, ge=0.0, le=1.0)
+    max_detections: Optional[int] = Field(None, ge=1, le=1000)
+    enabled_classes: Optional[List[str]] = None
+    latency_budget_ms: Optional[float] = Field(None, gt=0)
+    max_frame_skip: int = Field(0, ge=0, le=30)
+
+
+class InferenceProfileResponse(InferenceProfileUpdate):
+    zone_id: int
+    updated_at: Optional[datetime] = None
+
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1 +1,3 @@
-from app.services.detection_service import DetectionService
\ No newline at end of file
+from app.services.detection_service import DetectionService
+from app.services.analytics_service import AnalyticsService
+from app.services.alert_service import AlertService
\ No newline at end of file
@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update, case
+from app.models import Alert, Detection
+from app.schemas import AlertBulkFilter
+from app.services.analytics_service import time_bucket, bucket_value
+
+
+class AlertService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _conditions(self, alert_filter: AlertBulkFilter) -> list:
+        conditions = []
+        if alert_filter.ids is not None:
+            conditions.append(Alert.id.in_(alert_filter.ids))
+        if alert_filter.zone_id is not None:
+            conditions.append(Alert.detection_id.in_(
+                select(Detection.id).where(Detection.zone_id == alert_filter.zone_id)
+            ))
+        if alert_filter.alert_type is not None:
+            conditions.append(Alert.alert_type == alert_filter.alert_type)
+        if alert_filter.status is not None:
+            conditions.append(Alert.status == alert_filter.status)
+        if alert_filter.created_from is not None:
+            conditions.append(Alert.created_at >= alert_filter.created_from)
+        if alert_filter.created_to is not None:
+            conditions.append(Alert.created_at < alert_filter.created_to)
+        return conditions
+
+    def _bulk_conditions(self, alert_filter: AlertBulkFilter) -> list:
+        conditions = self._conditions(alert_filter)
+        if not conditions:
+            raise ValueError("Bulk alert updates need at least one filter")
+        return conditions
+
+    def bulk_acknowledge(self, alert_filter: AlertBulkFilter, user_id: int) -> int:
+        result = self.db.execute(
+            update(Alert)
+            .where(*self._bulk_conditions(alert_filter), Alert.status == "new")
+            .values(
+                status="acknowledged",
+                acknowledged_by=user_id,
+                acknowledged_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def bulk_resolve(self, alert_filter: AlertBulkFilter, user_id: int, resolution_note: Optional[str] = None) -> int:
+        result = self.db.execute(
+            update(Alert)
+            .where(*self._bulk_conditions(alert_filter), Alert.status != "resolved")
+            .values(
+                status="resolved",
+                resolved_by=user_id,
+                resolved_at=datetime.utcnow(),
+                resolution_note=resolution_note
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def get_grouped(
+        self,
+        alert_filter: AlertBulkFilter,
+        bucket: str = "hour",
+        limit: int = 100
+    ) -> List[dict]:
+        bucket_col = time_bucket(self.db, Alert.created_at, bucket).label("bucket")
+        query = (
+            self.db.query(
+                Detection.zone_id,
+                Alert.alert_type,
+                bucket_col,
+                func.count(Alert.id).label("count"),
+                func.sum(case((Alert.status == "new", 1), else_=0)).label("new_count"),
+                func.min(Alert.created_at).label("first_alert_at"),
+                func.max(Alert.created_at).label("last_alert_at")
+            )
+            .join(Detection, Detection.id == Alert.detection_id)
+            .filter(*self._conditions(alert_filter))
+            .group_by(Detection.zone_id, Alert.alert_type, bucket_col)
+            .order_by(func.max(Alert.created_at).desc())
+            .limit(limit)
+        )
+
+        return [
+            {
+                "zone_id": row.zone_id,
+                "alert_type": row.alert_type,
+                "bucket": bucket_value(row.bucket),
+                "count": row.count,
+                "new_count": row.new_count or 0,
+                "first_alert_at": bucket_value(row.first_alert_at),
+                "last_alert_at": bucket_value(row.last_alert_at)
+            }
+            for row in query.all()
+        ]
\ No newline at end of file
@@ -0,0 +1,228 @@
+import csv
+import io
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Optional, List, Iterator
+from sqlalchemy.orm import Session
+from sqlalchemy import func, cast, Integer, insert, exists
+from app.core.cache import invalidate_cache
+from app.core.database import SessionLocal
+from app.models import Detection, DetectionObject
+from app.ml.detector import PPEDetector
+
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H:00:00",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m-01"
+}
+
+logger = logging.getLogger(__name__)
+
+backfill_lock = threading.Lock()
+
+EXPORT_COLUMNS = [
+    "detection_id", "zone_id", "created_at", "class_id", "class_name",
+    "confidence", "x1", "y1", "x2", "y2", "is_violation"
+]
+
+
+def time_bucket(db: Session, column, bucket: str):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(bucket, column)
+    return func.strftime(BUCKET_FORMATS[bucket], column)
+
+
+def bucket_value(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def class_name(class_id: int) -> str:
+    return PPEDetector.CLASS_NAMES.get(class_id, f"class_{class_id}")
+
+
+class AnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _filtered(
+        self,
+        query,
+        zone_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        class_ids: Optional[List[int]] = None,
+        violations_only: bool = False
+    ):
+        if zone_id is not None:
+            query = query.filter(DetectionObject.zone_id == zone_id)
+        if start is not None:
+            query = query.filter(DetectionObject.created_at >= start)
+        if end is not None:
+            query = query.filter(DetectionObject.created_at < end)
+        if class_ids:
+            query = query.filter(DetectionObject.class_id.in_(class_ids))
+        if violations_only:
+            query = query.filter(DetectionObject.is_violation == True)
+        return query
+
+    def _floor(self, expr):
+        if self.db.get_bind().dialect.name == "postgresql":
+            return cast(func.floor(expr), Integer)
+        return cast(expr, Integer)
+
+    def get_timeseries(
+        self,
+        bucket: str = "hour",
+        zone_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        class_ids: Optional[List[int]] = None,
+        violations_only: bool = False
+    ) -> List[dict]:
+        bucket_col = time_bucket(self.db, DetectionObject.created_at, bucket).label("bucket")
+        query = self.db.query(
+            bucket_col,
+            DetectionObject.zone_id,
+            DetectionObject.class_id,
+            func.count(DetectionObject.id).label("count")
+        )
+        query = self._filtered(query, zone_id, start, end, class_ids, violations_only)
+        rows = query.group_by(bucket_col, DetectionObject.zone_id, DetectionObject.class_id).order_by(bucket_col).all()
+
+        return [
+            {
+                "bucket": bucket_value(row.bucket),
+                "zone_id": row.zone_id,
+                "class_id": row.class_id,
+                "class_name": class_name(row.class_id),
+                "count": row.count
+            }
+            for row in rows
+        ]
+
+    def get_heatmap(
+        self,
+        cell_size: int = 64,
+        zone_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        class_ids: Optional[List[int]] = None,
+        violations_only: bool = False
+    ) -> dict:
+        cell_x = self._floor((DetectionObject.x1 + DetectionObject.x2) / (2.0 * cell_size)).label("x")
+        cell_y = self._floor((DetectionObject.y1 + DetectionObject.y2) / (2.0 * cell_size)).label("y")
+        query = self.db.query(cell_x, cell_y, func.count(DetectionObject.id).label("count"))
+        query = self._filtered(query, zone_id, start, end, class_ids, violations_only)
+        rows = query.group_by(cell_x, cell_y).all()
+
+        return {
+            "cell_size": cell_size,
+            "cells": [{"x": row.x, "y": row.y, "count": row.count} for row in rows]
+        }
+
+    def get_violation_counts(self, zone_id: Optional[int] = None) -> dict:
+        query = self.db.query(
+            DetectionObject.class_id,
+            func.count(func.distinct(DetectionObject.detection_id))
+        )
+        query = self._filtered(query, zone_id=zone_id, violations_only=True)
+        rows = query.group_by(DetectionObject.class_id).all()
+        return {class_name(class_id): count for class_id, count in rows}
+
+    def backfill_objects(self, batch_size: int = 1000) -> int:
+        last_id = 0
+        total = 0
+        has_objects = exists().where(DetectionObject.detection_id == Detection.id)
+        while True:
+            detections = (
+                self.db.query(Detection.id, Detection.zone_id, Detection.created_at, Detection.detected_objects)
+                .filter(Detection.id > last_id, ~has_objects)
+                .order_by(Detection.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not detections:
+                break
+            rows = []
+            for det in detections:
+                rows.extend(DetectionObject.rows_from_objects(
+                    det.id, det.zone_id, det.detected_objects or [], det.created_at
+                ))
+            if rows:
+                self.db.execute(insert(DetectionObject), rows)
+            self.db.commit()
+            total += len(detections)
+            last_id = detections[-1].id
+        return total
+
+
+def run_backfill() -> Optional[int]:
+    if not backfill_lock.acquire(blocking=False):
+        return None
+    db = SessionLocal()
+    try:
+        total = AnalyticsService(db).backfill_objects()
+    finally:
+        db.close()
+        backfill_lock.release()
+    invalidate_cache("stats")
+    logger.info("Backfilled detection_objects for %s detections", total)
+    return total
+
+
+def iter_export(
+    fmt: str = "ndjson",
+    zone_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    class_ids: Optional[List[int]] = None,
+    violations_only: bool = False,
+    chunk_rows: int = 1000
+) -> Iterator[str]:
+    db = SessionLocal()
+    try:
+        service = AnalyticsService(db)
+        query = db.query(
+            DetectionObject.detection_id,
+            DetectionObject.zone_id,
+            DetectionObject.created_at,
+            DetectionObject.class_id,
+            DetectionObject.confidence,
+            DetectionObject.x1,
+            DetectionObject.y1,
+            DetectionObject.x2,
+            DetectionObject.y2,
+            DetectionObject.is_violation
+        )
+        query = service._filtered(query, zone_id, start, end, class_ids, violations_only)
+        query = query.order_by(DetectionObject.id).execution_options(yield_per=chunk_rows)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+
+        for i, row in enumerate(query, start=1):
+            values = [
+                row.detection_id, row.zone_id, row.created_at.isoformat() if row.created_at else None,
+                row.class_id, class_name(row.class_id), row.confidence,
+                row.x1, row.y1, row.x2, row.y2, row.is_violation
+            ]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                buffer.write("\n")
+            if i % chunk_rows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
\ No newline at end of file
@@ -1,79 +1,198 @@
+import asyncio
 import uuid
-import cv2
-import aiofiles
+from types import SimpleNamespace
 from pathlib import Path
+from time import perf_counter
 from typing import Optional, List, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from fastapi import UploadFile
+from app.core.cache import get_cache, invalidate_cache
 from app.core.config import settings
-from app.models import Detection, Alert
-from app.ml.detector import get_detector
+from app.core.metrics import track_stage, track_inference_queue, MOTION_GATE_FRAMES
+from app.core.storage import get_storage
+from app.models import Detection, InferenceProfile, Zone
+from app.schemas import IngestRecord, InferenceProfileResponse
+from app.ml.adaptive import InferenceParams, get_adaptive_controller
+from app.ml.detector import PPEDetector, get_detector
+from app.ml.motion_gate import get_motion_gate
+from app.services.analytics_service import AnalyticsService
+from app.services.write_behind import get_write_behind, insert_detections
 
 
 class DetectionService:
     def __init__(self, db: Session):
         self.db = db
-        self.detector = get_detector()
-        self.upload_dir = Path(settings.UPLOAD_DIR)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.storage = get_storage()
+        self.motion_gate = get_motion_gate() if settings.MOTION_GATE_ENABLED else None
+        self.adaptive = get_adaptive_controller()
 
-    async def save_upload_file(self, file: UploadFile) -> str:
-        ext = Path(file.filename).suffix
-        filename = f"{uuid.uuid4()}{ext}"
-        filepath = self.upload_dir / filename
-        
-        async with aiofiles.open(filepath, "wb") as f:
-            content = await file.read()
-            await f.write(content)
-        
-        return str(filepath)
+    @property
+    def detector(self) -> PPEDetector:
+        return get_detector()
+
+    async def save_upload_file(self, file: UploadFile, content: bytes) -> str:
+        ext = Path(file.filename or "").suffix
+        key = f"{uuid.uuid4()}{ext}"
+        return await self.storage.save(key, content, file.content_type)
 
     async def process_image(
         self,
         file: UploadFile,
         user_id: Optional[int] = None,
-        zone_id: Optional[int] = None
+        zone_id: Optional[int] = None,
+        camera_id: Optional[str] = None
     ) -> Detection:
-        original_path = await self.save_upload_file(file)
-        
-        result_filename = f"result_{uuid.uuid4()}.jpg"
-        result_path = str(self.upload_dir / result_filename)
-        
-        detection_result = self.detector.process_image(original_path, result_path)
-        
-        detection = Detection(
-            user_id=user_id,
-            zone_id=zone_id,
-            original_image_path=original_path,
-            result_image_path=result_path,
-            detected_objects=detection_result["detected_objects"],
-            violations=detection_result["violations"],
-            person_count=detection_result["person_count"],
-            violation_count=detection_result["violation_count"],
-            has_violation=detection_result["has_violation"],
-            processing_time_ms=detection_result["processing_time_ms"]
-        )
-        
-        self.db.add(detection)
-        self.db.commit()
-        self.db.refresh(detection)
-        
-        if detection.has_violation:
-            self._create_alerts(detection)
-        
-        return detection
-
-    def _create_alerts(self, detection: Detection):
-        for violation in detection.violations:
-            alert = Alert(
-                detection_id=detection.id,
-                alert_type=violation,
-                message=f"ตรวจพบ: {violation}"
+        with track_stage("upload_read"):
+            content = await file.read()
+        with track_stage("disk_write"):
+            original_key = await self.save_upload_file(file, content)
+        
+        gate_key = camera_id or (f"zone:{zone_id}" if zone_id is not None else None)
+        params = self.get_inference_params(zone_id)
+        if gate_key is not None:
+            imgsz, skipped_result = self.adaptive.plan(gate_key, params)
+        else:
+            imgsz, skipped_result = params.input_size, None
+        
+        # the gauge counts requests holding or waiting for the model, not upload or storage I/O
+        with track_inference_queue():
+            start_time = perf_counter()
+            with track_stage("decode"):
+                image, scale = self._decode(content, imgsz)
+            if skipped_result is not None:
+                detection_result = {**skipped_result, "processing_time_ms": 0}
+            else:
+                detection_result, inferred = self._detect(image, gate_key, params.detect_kwargs(imgsz), scale)
+                if inferred and gate_key is not None:
+                    self.adaptive.record(gate_key, params, (perf_counter() - start_time) * 1000, detection_result)
+        if scale != 1.0 and not settings.REDUCED_RESULT_IMAGE:
+            # the result image is the evidence operators review, so keep it at full resolution
+            with track_stage("decode"):
+                image, scale = self.detector.decode_image(content), 1.0
+        with track_stage("draw"):
+            result_image = self.detector.draw_detections(image, detection_result["detected_objects"], scale)
+        with track_stage("encode_write"):
+            result_key = await self.storage.save(
+                f"result_{uuid.uuid4()}.jpg",
+                self.detector.encode_image(result_image),
+                "image/jpeg"
             )
-            self.db.add(alert)
-        self.db.commit()
+        
+        record = {
+            "user_id": user_id,
+            "zone_id": zone_id,
+            "camera_id": camera_id,
+            "original_image_path": original_key,
+            "result_image_path": result_key,
+            "detected_objects": detection_result["detected_objects"],
+            "violations": detection_result["violations"],
+            "person_count": detection_result["person_count"],
+            "violation_count": detection_result["violation_count"],
+            "has_violation": detection_result["has_violation"],
+            "processing_time_ms": detection_result["processing_time_ms"],
+            "created_at": datetime.now(timezone.utc)
+        }
+        
+        with track_stage("db_insert"):
+            buffer = get_write_behind()
+            if buffer is not None:
+                detection_id = await buffer.write(record)
+            else:
+                detection_id = insert_detections(self.db, [record])[0]
+                self.db.commit()
+        invalidate_cache("stats")
+        
+        return Detection(id=detection_id, **record)
+
+    def find_unknown_zones(self, records: List[IngestRecord]) -> List[Tuple[int, int]]:
+        zone_ids = {record.zone_id for record in records if record.zone_id is not None}
+        if not zone_ids:
+            return []
+        known = {zone_id for (zone_id,) in self.db.query(Zone.id).filter(Zone.id.in_(zone_ids))}
+        return [
+            (index, record.zone_id) for index, record in enumerate(records)
+            if record.zone_id is not None and record.zone_id not in known
+        ]
+
+    async def ingest_records(self, records: List[IngestRecord], user_id: Optional[int] = None) -> List[int]:
+        async def save_thumbnail(record: IngestRecord) -> Optional[str]:
+            if record.thumbnail is None:
+                return None
+            return await self.storage.save(f"thumb_{uuid.uuid4()}.jpg", record.thumbnail, "image/jpeg")
+        
+        with track_stage("disk_write"):
+            thumbnail_keys = await asyncio.gather(*[save_thumbnail(r) for r in records])
+        
+        rows = []
+        for record, thumbnail_key in zip(records, thumbnail_keys):
+            summary = PPEDetector.summarize([
+                PPEDetector.build_object(obj.class_id, obj.confidence, obj.bbox) for obj in record.objects
+            ])
+            captured_at = record.captured_at
+            if captured_at.tzinfo is None:
+                captured_at = captured_at.replace(tzinfo=timezone.utc)
+            rows.append({
+                "user_id": user_id,
+                "zone_id": record.zone_id,
+                "camera_id": record.camera_id,
+                "original_image_path": thumbnail_key,
+                "result_image_path": None,
+                "processing_time_ms": record.processing_time_ms,
+                "created_at": captured_at,
+                **summary
+            })
+        
+        with track_stage("db_insert"):
+            ids = insert_detections(self.db, rows)
+            self.db.commit()
+        invalidate_cache("stats")
+        
+        return ids
+
+    def get_inference_params(self, zone_id: Optional[int]) -> InferenceParams:
+        if zone_id is None:
+            return InferenceParams()
+        # cached with the zone responses, so PUT /zones/{id}/profile invalidates it
+        cache = get_cache()
+        full_key, entry = cache.get("zones", f"{zone_id}:inference")
+        if entry is not None:
+            return InferenceParams(SimpleNamespace(**orjson.loads(entry[1])))
+        
+        profile = self.db.query(InferenceProfile).filter(InferenceProfile.zone_id == zone_id).first()
+        values = {} if profile is None else InferenceProfileResponse.model_validate(profile).model_dump(mode="json")
+        cache.set(full_key, "", orjson.dumps(values))
+        return InferenceParams(SimpleNamespace(**values))
+
+    def _decode(self, content: bytes, imgsz: int) -> Tuple[object, float]:
+        if settings.REDUCED_DECODE_ENABLED:
+            return self.detector.decode_image_reduced(content, imgsz)
+        return self.detector.decode_image(content), 1.0
+
+    def _detect(
+        self,
+        image,
+        gate_key: Optional[str] = None,
+        options: Optional[dict] = None,
+        scale: float = 1.0
+    ) -> Tuple[dict, bool]:
+        options = options or {}
+        if self.motion_gate is None or gate_key is None:
+            return self.detector.detect(image, scale=scale, **options), True
+        
+        start_time = perf_counter()
+        cached_result, thumb = self.motion_gate.check(gate_key, image)
+        if cached_result is not None:
+            MOTION_GATE_FRAMES.labels("skipped").inc()
+            processing_time = (perf_counter() - start_time) * 1000
+            return {**cached_result, "processing_time_ms": round(processing_time, 2)}, False
+        
+        MOTION_GATE_FRAMES.labels("inferred").inc()
+        detection_result = self.detector.detect(image, scale=scale, **options)
+        self.motion_gate.update(gate_key, thumb, detection_result)
+        return detection_result, True
 
     def get_detection(self, detection_id: int) -> Optional[Detection]:
         return self.db.query(Detection).filter(Detection.id == detection_id).first()
@@ -83,8 +202,9 @@ class DetectionService:
         skip: int = 0,
         limit: int = 20,
         zone_id: Optional[int] = None,
-        has_violation: Optional[bool] = None
-    ) -> Tuple[List[Detection], int]:
+        has_violation: Optional[bool] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[list, int]:
         query = self.db.query(Detection)
         
         if zone_id is not None:
@@ -94,9 +214,13 @@ class DetectionService:
             query = query.filter(Detection.has_violation == has_violation)
         
         total = query.count()
-        detections = query.order_by(Detection.created_at.desc()).offset(skip).limit(limit).all()
+        query = query.order_by(Detection.created_at.desc()).offset(skip).limit(limit)
         
-        return detections, total
+        if columns is not None:
+            rows = query.with_entities(*[getattr(Detection, c) for c in columns]).all()
+            return [row._asdict() for row in rows], total
+        
+        return query.all(), total
 
     def get_stats(self, zone_id: Optional[int] = None) -> dict:
         query = self.db.query(Detection)
@@ -104,13 +228,13 @@ class DetectionService:
         if zone_id is not None:
             query = query.filter(Detection.zone_id == zone_id)
         
-        total_detections = query.count()
-        
         stats = query.with_entities(
+            func.count(Detection.id).label("total_detections"),
             func.sum(Detection.person_count).label("total_persons"),
             func.sum(Detection.violation_count).label("total_violations")
         ).first()
         
+        total_detections = stats.total_detections or 0
         total_persons = stats.total_persons or 0
         total_violations = stats.total_violations or 0
         
@@ -118,11 +242,7 @@ class DetectionService:
         if total_persons > 0:
             compliance_rate = round(((total_persons - total_violations) / total_persons) * 100, 2)
         
-        violation_by_type = {}
-        detections = query.all()
-        for det in detections:
-            for violation in det.violations:
-                violation_by_type[violation] = violation_by_type.get(violation, 0) + 1
+        violation_by_type = AnalyticsService(self.db).get_violation_counts(zone_id=zone_id)
         
         return {
             "total_detections": total_detections,
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import Dict, List, Optional
+from sqlalchemy import delete, insert, update
+from app.core.database import SessionLocal
+from app.core.storage import StorageBackend
+from app.ml.adaptive import InferenceParams
+from app.ml.detector import PPEDetector
+from app.models import Detection, DetectionObject, InferenceProfile
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self.next_at = perf_counter()
+
+    def acquire(self, count: int = 1):
+        if not self.interval:
+            return
+        now = perf_counter()
+        if self.next_at > now:
+            sleep(self.next_at - now)
+        self.next_at = max(self.next_at, now) + self.interval * count
+
+
+class RescoreJob:
+    def __init__(
+        self,
+        detector: PPEDetector,
+        storage: StorageBackend,
+        checkpoint_path: str,
+        batch_size: int = 16,
+        readers: int = 4,
+        prefetch_batches: int = 2,
+        max_images_per_second: float = 0.0,
+        zone_id: Optional[int] = None,
+        max_changed_ids: int = 1000,
+        session_factory=SessionLocal
+    ):
+        self.detector = detector
+        self.storage = storage
+        self.checkpoint_path = Path(checkpoint_path)
+        self.batch_size = batch_size
+        self.readers = readers
+        self.prefetch_batches = prefetch_batches
+        self.rate_limiter = RateLimiter(max_images_per_second)
+        self.zone_id = zone_id
+        self.max_changed_ids = max_changed_ids
+        self.session_factory = session_factory
+        self.state = self._load_checkpoint()
+        self.profiles = self._load_profiles()
+
+    def _load_checkpoint(self) -> Dict:
+        if self.checkpoint_path.exists():
+            state = json.loads(self.checkpoint_path.read_text())
+            if state.get("model_path") != self.detector.model_path:
+                raise ValueError(
+                    f"Checkpoint was created with {state.get('model_path')}, not {self.detector.model_path}"
+                )
+            if state.get("zone_id") != self.zone_id:
+                raise ValueError(
+                    f"Checkpoint was created for zone {state.get('zone_id')}, not {self.zone_id}"
+                )
+            return state
+        return {
+            "model_path": self.detector.model_path,
+            "zone_id": self.zone_id,
+            "last_id": 0,
+            "finished": False,
+            "report": {
+                "processed": 0,
+                "changed": 0,
+                "missing_images": 0,
+                "violation_count_before": 0,
+                "violation_count_after": 0,
+                "violations_added": {},
+                "violations_removed": {},
+                "changed_ids": []
+            }
+        }
+
+    def _load_profiles(self) -> Dict[int, InferenceParams]:
+        # rescoring uses each zone's profile at its full input size, like live scoring does
+        db = self.session_factory()
+        try:
+            profiles = {profile.zone_id: profile for profile in db.query(InferenceProfile).all()}
+        finally:
+            db.close()
+        return {zone_id: self._params(profile) for zone_id, profile in profiles.items()}
+
+    def _params(self, profile=None) -> InferenceParams:
+        params = InferenceParams(profile)
+        # the job's --confidence replaces the global default, not a zone's own threshold
+        if getattr(profile, "confidence_threshold", None) is None:
+            params.conf = self.detector.confidence_threshold
+        return params
+
+    def _save_checkpoint(self):
+        tmp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _pages(self):
+        last_id = self.state["last_id"]
+        while True:
+            db = self.session_factory()
+            try:
+                query = db.query(
+                    Detection.id,
+                    Detection.zone_id,
+                    Detection.created_at,
+                    Detection.original_image_path,
+                    Detection.violations,
+                    Detection.violation_count
+                ).filter(
+                    Detection.id > last_id,
+                    # ingested rows carry edge results and at most a thumbnail, nothing to rescore
+                    Detection.original_image_path.isnot(None),
+                    Detection.result_image_path.isnot(None)
+                )
+                if self.zone_id is not None:
+                    query = query.filter(Detection.zone_id == self.zone_id)
+                rows = query.order_by(Detection.id).limit(self.batch_size).all()
+            finally:
+                db.close()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield rows
+
+    def _load_image(self, key: str):
+        return self.detector.decode_image(self.storage.read_sync(key))
+
+    def run(self) -> Dict:
+        if self.state["finished"]:
+            return self.state["report"]
+
+        with ThreadPoolExecutor(self.readers, thread_name_prefix="rescore-reader") as pool:
+            pending = deque()
+            for rows in self._pages():
+                futures = [pool.submit(self._load_image, row.original_image_path) for row in rows]
+                pending.append((rows, futures))
+                if len(pending) > self.prefetch_batches:
+                    self._process(*pending.popleft())
+            while pending:
+                self._process(*pending.popleft())
+
+        self.state["finished"] = True
+        self._save_checkpoint()
+        return self.state["report"]
+
+    def _process(self, rows, futures: List[Future]):
+        report = self.state["report"]
+        loaded = []
+        for row, future in zip(rows, futures):
+            try:
+                loaded.append((row, future.result()))
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping detection %s: %s", row.id, e)
+                report["missing_images"] += 1
+
+        self.rate_limiter.acquire(len(loaded))
+        by_zone: Dict[Optional[int], List[int]] = {}
+        for index, (row, _) in enumerate(loaded):
+            by_zone.setdefault(row.zone_id, []).append(index)
+        results = [None] * len(loaded)
+        for zone_id, indexes in by_zone.items():
+            params = self.profiles.get(zone_id) or self._params()
+            zone_results = self.detector.detect_batch(
+                [loaded[i][1] for i in indexes], **params.detect_kwargs(params.input_size)
+            )
+            for i, result in zip(indexes, zone_results):
+                results[i] = result
+
+        updates = []
+        object_rows = []
+        for (row, _), result in zip(loaded, results):
+            updates.append({
+                "id": row.id,
+                "created_at": row.created_at,
+                "detected_objects": result["detected_objects"],
+                "violations": result["violations"],
+                "person_count": result["person_count"],
+                "violation_count": result["violation_count"],
+                "has_violation": result["has_violation"]
+            })
+            object_rows.extend(DetectionObject.rows_from_objects(
+                row.id, row.zone_id, result["detected_objects"], row.created_at
+            ))
+            self._record_diff(row, result)
+
+        db = self.session_factory()
+        try:
+            if updates:
+                db.execute(update(Detection), updates)
+                db.execute(delete(DetectionObject).where(
+                    DetectionObject.detection_id.in_([u["id"] for u in updates])
+                ))
+                if object_rows:
+                    db.execute(insert(DetectionObject), object_rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self.state["last_id"] = rows[-1].id
+        self._save_checkpoint()
+        logger.info("Rescored up to detection %s (%s processed)", rows[-1].id, report["processed"])
+
+    def _record_diff(self, row, result: Dict):
+        report = self.state["report"]
+        before = set(row.violations or [])
+        after = set(result["violations"])
+        report["processed"] += 1
+        report["violation_count_before"] += row.violation_count or 0
+        report["violation_count_after"] += result["violation_count"]
+        for name in after - before:
+            report["violations_added"][name] = report["violations_added"].get(name, 0) + 1
+        for name in before - after:
+            report["violations_removed"][name] = report["violations_removed"].get(name, 0) + 1
+        if before != after:
+            report["changed"] += 1
+            if len(report["changed_ids"]) < self.max_changed_ids:
+                report["changed_ids"].append(row.id)
\ No newline at end of file
@@ -0,0 +1,178 @@
+# Write-behind buffer for detections and their alerts.
+#
+# Durability: a caller awaiting WriteBehindBuffer.write() only gets a detection id
+# after the batch containing it has been committed, so every acknowledged upload
+# is durable. What the buffer trades is latency (up to WRITE_BEHIND_FLUSH_MS) for
+# fewer transactions. Records still waiting in memory when the process is killed
+# without a graceful shutdown are lost, but their requests have not been answered
+# yet. On graceful shutdown stop() flushes everything that is pending.
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import track_stage
+from app.models import Detection, Alert, DetectionObject
+
+logger = logging.getLogger(__name__)
+
+
+def alert_rows(detection_id: int, violations: List[str], created_at=None) -> List[Dict]:
+    rows = []
+    for violation in violations:
+        row = {
+            "detection_id": detection_id,
+            "alert_type": violation,
+            "message": f"ตรวจพบ: {violation}"
+        }
+        if created_at is not None:
+            row["created_at"] = created_at
+        rows.append(row)
+    return rows
+
+
+def insert_detections(db: Session, records: List[Dict]) -> List[int]:
+    result = db.execute(
+        insert(Detection).returning(Detection.id, sort_by_parameter_order=True),
+        records
+    )
+    ids = list(result.scalars())
+
+    object_rows = []
+    alerts = []
+    for detection_id, record in zip(ids, records):
+        object_rows.extend(DetectionObject.rows_from_objects(
+            detection_id, record["zone_id"], record["detected_objects"], record.get("created_at")
+        ))
+        if record["has_violation"]:
+            alerts.extend(alert_rows(detection_id, record["violations"], record.get("created_at")))
+
+    if object_rows:
+        db.execute(insert(DetectionObject), object_rows)
+    if alerts:
+        with track_stage("alert_insert"):
+            db.execute(insert(Alert), alerts)
+
+    return ids
+
+
+class WriteBehindBuffer:
+    def __init__(self, session_factory=SessionLocal, max_rows: int = 100, flush_ms: float = 50.0):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.flush_interval = flush_ms / 1000
+        self._pending: List[Tuple[Dict, Future]] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict) -> Future:
+        future = Future()
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("write-behind buffer is stopped")
+            self._pending.append((record, future))
+            self._cond.notify()
+        return future
+
+    async def write(self, record: Dict) -> int:
+        return await asyncio.wrap_future(self.submit(record))
+
+    def _next_batch(self) -> Optional[List[Tuple[Dict, Future]]]:
+        with self._cond:
+            while not self._pending and not self._stopping:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            deadline = monotonic() + self.flush_interval
+            while len(self._pending) < self.max_rows and not self._stopping:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_rows]
+            del self._pending[:self.max_rows]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("Write-behind flush of %d detections failed", len(batch))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("write-behind flush failed"))
+
+    def _flush(self, batch: List[Tuple[Dict, Future]]):
+        # Claim each future before writing: a request cancelled while waiting is dropped
+        # here instead of being inserted, and claimed futures can no longer be cancelled
+        batch = [(record, future) for record, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        db = self.session_factory()
+        try:
+            try:
+                ids = insert_detections(db, [record for record, _ in batch])
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Batch insert of %d detections failed, retrying one by one", len(batch))
+                for record, future in batch:
+                    self._flush_one(db, record, future)
+                return
+            for (_, future), detection_id in zip(batch, ids):
+                future.set_result(detection_id)
+        finally:
+            db.close()
+
+    def _flush_one(self, db: Session, record: Dict, future: Future):
+        try:
+            detection_id = insert_detections(db, [record])[0]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            future.set_exception(e)
+            return
+        future.set_result(detection_id)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+
+write_behind = None
+
+def get_write_behind() -> Optional[WriteBehindBuffer]:
+    global write_behind
+    if not settings.WRITE_BEHIND_ENABLED:
+        return None
+    if write_behind is None:
+        write_behind = WriteBehindBuffer(
+            max_rows=settings.WRITE_BEHIND_MAX_ROWS,
+            flush_ms=settings.WRITE_BEHIND_FLUSH_MS
+        )
+        write_behind.start()
+    return write_behind
+
+
+def stop_write_behind():
+    global write_behind
+    if write_behind is not None:
+        write_behind.stop()
+        write_behind = None
\ No newline at end of file
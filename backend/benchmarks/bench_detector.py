@@ -0,0 +1,38 @@
+import argparse
+from benchmarks.common import make_stub_detector, make_image, measure, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for PPEDetector decoding and drawing")
+    parser.add_argument("--box-counts", default="1,20,100,500")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--decode-targets", default="640,320", help="Input sizes for reduced JPEG decode")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    image = make_image(args.width, args.height)
+    results = {}
+    for box_count in [int(n) for n in args.box_counts.split(",")]:
+        detector = make_stub_detector(box_count)
+        detection = detector.detect(image)
+        results[f"detect[{box_count}]"] = measure(lambda: detector.detect(image), args.repeat)
+        results[f"draw_detections[{box_count}]"] = measure(
+            lambda: detector.draw_detections(image, detection["detected_objects"]), args.repeat
+        )
+
+    encoded = make_stub_detector(0).encode_image(image)
+    detector = make_stub_detector(0)
+    results["decode_image"] = measure(lambda: detector.decode_image(encoded), args.repeat)
+    results["encode_image"] = measure(lambda: detector.encode_image(image), args.repeat)
+    for target_size in [int(n) for n in args.decode_targets.split(",")]:
+        results[f"decode_image_reduced[{target_size}]"] = measure(
+            lambda: detector.decode_image_reduced(encoded, target_size), args.repeat
+        )
+
+    write_report("detector", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import gzip
+import json
+from datetime import datetime
+from benchmarks.common import make_detection_rows, measure, write_report
+
+
+def make_page(per_page: int):
+    rows = make_detection_rows(per_page, [None, 1, 2])
+    for i, row in enumerate(rows, start=1):
+        row["id"] = i
+        row["created_at"] = datetime.utcnow()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size and serialization time per /detection/history page")
+    parser.add_argument("--per-page", default="20,100")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from app.schemas import DetectionResponse, DetectionSummary
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    results = {}
+    for per_page in [int(n) for n in args.per_page.split(",")]:
+        page = make_page(per_page)
+        summary_fields = list(DetectionSummary.model_fields)
+        summary_page = [{k: row[k] for k in summary_fields} for row in page]
+
+        def validate_jsonable():
+            return json.dumps(jsonable_encoder({"items": [DetectionResponse.model_validate(r) for r in page]})).encode()
+
+        def validate_orjson():
+            return orjson.dumps({"items": [DetectionResponse.model_validate(r).model_dump() for r in page]})
+
+        def summary_orjson():
+            return orjson.dumps({"items": summary_page})
+
+        for name, fn in (
+            ("full_pydantic_json", validate_jsonable),
+            ("full_orjson", validate_orjson),
+            ("summary_orjson", summary_orjson)
+        ):
+            body = fn()
+            result = measure(fn, args.repeat)
+            result["bytes"] = len(body)
+            result["gzip_bytes"] = len(gzip.compress(body, compresslevel=6))
+            if brotli is not None:
+                result["brotli_bytes"] = len(brotli.compress(body, quality=4))
+            results[f"{name}[{per_page}]"] = result
+
+    write_report("serialization", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+from sqlalchemy import insert, delete
+from benchmarks.common import install_stub_detector, make_detection_rows, measure, write_report
+
+
+def populate(db, count: int, zone_ids):
+    from app.models import Detection, DetectionObject
+    from app.services import AnalyticsService
+
+    db.execute(delete(DetectionObject))
+    db.execute(delete(Detection))
+    batch_size = 5000
+    for offset in range(0, count, batch_size):
+        rows = make_detection_rows(min(batch_size, count - offset), zone_ids, seed=offset)
+        db.execute(insert(Detection), rows)
+    db.commit()
+    AnalyticsService(db).backfill_objects(batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DetectionService.get_stats at various table sizes")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal, init_db
+    from app.models import Zone
+    from app.services import DetectionService
+
+    init_db()
+    install_stub_detector()
+    db = SessionLocal()
+    try:
+        if db.query(Zone).count() == 0:
+            db.add_all([Zone(name=f"Benchmark zone {i}") for i in range(1, 5)])
+            db.commit()
+        zone_ids = [None] + [z.id for z in db.query(Zone).all()]
+        service = DetectionService(db)
+
+        results = {}
+        for size in [int(n) for n in args.sizes.split(",")]:
+            populate(db, size, zone_ids)
+            results[f"get_stats[{size}]"] = measure(lambda: service.get_stats(), args.repeat, warmup=1)
+            results[f"get_stats_zone[{size}]"] = measure(
+                lambda: service.get_stats(zone_id=zone_ids[1]), args.repeat, warmup=1
+            )
+            results[f"get_detections[{size}]"] = measure(
+                lambda: service.get_detections(skip=0, limit=100), args.repeat, warmup=1
+            )
+    finally:
+        db.close()
+
+    write_report("stats", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from time import perf_counter
+from benchmarks.common import make_detection_rows, summarize, write_report
+
+
+def make_records(count: int):
+    records = make_detection_rows(count, [None])
+    for record in records:
+        record["user_id"] = None
+        record["created_at"] = datetime.now(timezone.utc)
+    return records
+
+
+def run_per_request(records, concurrency: int, legacy: bool):
+    from app.core.database import SessionLocal
+    from app.models import Detection, Alert, DetectionObject
+    from app.services.write_behind import insert_detections
+
+    def handle(record):
+        t0 = perf_counter()
+        db = SessionLocal()
+        try:
+            if legacy:
+                detection = Detection(**record)
+                db.add(detection)
+                db.commit()
+                db.refresh(detection)
+                db.add_all([
+                    DetectionObject(**row)
+                    for row in DetectionObject.rows_from_objects(detection.id, None, record["detected_objects"])
+                ])
+                for violation in record["violations"]:
+                    db.add(Alert(detection_id=detection.id, alert_type=violation, message=f"ตรวจพบ: {violation}"))
+                db.commit()
+            else:
+                insert_detections(db, [record])
+                db.commit()
+        finally:
+            db.close()
+        return (perf_counter() - t0) * 1000
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        samples = list(pool.map(handle, records))
+    return summarize(samples, perf_counter() - start)
+
+
+def run_write_behind(records, max_rows: int, flush_ms: float):
+    from app.services.write_behind import WriteBehindBuffer
+
+    buffer = WriteBehindBuffer(max_rows=max_rows, flush_ms=flush_ms)
+    buffer.start()
+    submitted = []
+    start = perf_counter()
+    for record in records:
+        t0 = perf_counter()
+        future = buffer.submit(record)
+        future.add_done_callback(lambda _, t0=t0: submitted.append((perf_counter() - t0) * 1000))
+    buffer.stop()
+    elapsed = perf_counter() - start
+    return summarize(submitted, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request commits with the write-behind buffer")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-rows", type=int, default=100)
+    parser.add_argument("--flush-ms", type=float, default=50.0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    from app.core.database import init_db
+
+    init_db()
+    results = {
+        "per_request_legacy": run_per_request(make_records(args.rows), args.concurrency, legacy=True),
+        "per_request_single_tx": run_per_request(make_records(args.rows), args.concurrency, legacy=False),
+        "write_behind": run_write_behind(make_records(args.rows), args.max_rows, args.flush_ms)
+    }
+    write_report("write_behind", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("UPLOAD_DIR", "./benchmark_uploads")
+
+import numpy as np
+
+
+class StubBoxes:
+    def __init__(self, count: int, width: int, height: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        x1 = rng.uniform(0, width * 0.8, count)
+        y1 = rng.uniform(0, height * 0.8, count)
+        self.cls = rng.integers(0, 10, count).astype(np.float32)
+        self.conf = rng.uniform(0.5, 1.0, count).astype(np.float32)
+        self.xyxy = np.stack(
+            [x1, y1, x1 + rng.uniform(20, width * 0.2, count), y1 + rng.uniform(20, height * 0.2, count)],
+            axis=1
+        ).astype(np.float32)
+
+    def __iter__(self):
+        for i in range(len(self.cls)):
+            yield StubBox(self.cls[i:i + 1], self.conf[i:i + 1], self.xyxy[i:i + 1])
+
+
+class StubBox:
+    def __init__(self, cls, conf, xyxy):
+        self.cls = cls
+        self.conf = conf
+        self.xyxy = xyxy
+
+
+class StubResult:
+    def __init__(self, boxes: StubBoxes):
+        self.boxes = boxes
+
+
+class StubModel:
+    """Stand-in for a YOLO model that returns a fixed number of random boxes."""
+
+    def __init__(self, box_count: int = 20):
+        self.box_count = box_count
+
+    def __call__(self, image, **kwargs):
+        height, width = image.shape[:2]
+        return [StubResult(StubBoxes(self.box_count, width, height))]
+
+
+def make_stub_detector(box_count: int = 20):
+    from app.ml.detector import PPEDetector
+
+    class StubDetector(PPEDetector):
+        def _load_model(self):
+            self.model = StubModel(box_count)
+
+    return StubDetector()
+
+
+def install_stub_detector(box_count: int = 20):
+    import app.ml.detector as detector_module
+
+    detector_module.detector = make_stub_detector(box_count)
+    return detector_module.detector
+
+
+def make_image(width: int = 1280, height: int = 720, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def make_detection_rows(count: int, zone_ids: List[Optional[int]], seed: int = 0) -> List[Dict]:
+    from app.ml.detector import PPEDetector
+
+    rnd = random.Random(seed)
+    classes = list(PPEDetector.CLASS_NAMES.values())
+    rows = []
+    for _ in range(count):
+        objects = []
+        for _ in range(rnd.randint(1, 12)):
+            class_name = rnd.choice(classes)
+            objects.append({
+                "class_id": classes.index(class_name),
+                "class_name": class_name,
+                "confidence": round(rnd.uniform(0.5, 1.0), 4),
+                "bbox": [round(rnd.uniform(0, 1000), 2) for _ in range(4)],
+                "is_violation": class_name in PPEDetector.VIOLATION_CLASSES
+            })
+        violations = sorted({o["class_name"] for o in objects if o["is_violation"]})
+        rows.append({
+            "zone_id": rnd.choice(zone_ids),
+            "camera_id": f"cam-{rnd.randint(1, 8)}",
+            "original_image_path": "benchmark.jpg",
+            "result_image_path": "result_benchmark.jpg",
+            "detected_objects": objects,
+            "violations": violations,
+            "person_count": sum(1 for o in objects if o["class_name"] == "person"),
+            "violation_count": sum(1 for o in objects if o["is_violation"]),
+            "has_violation": bool(violations),
+            "processing_time_ms": round(rnd.uniform(20, 200), 2)
+        })
+    return rows
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float], elapsed_s: Optional[float] = None) -> Dict[str, float]:
+    summary = {
+        "count": len(samples_ms),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 4) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4)
+    }
+    if elapsed_s:
+        summary["throughput_per_s"] = round(len(samples_ms) / elapsed_s, 2)
+    return summary
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    start = perf_counter()
+    for _ in range(repeat):
+        t0 = perf_counter()
+        fn()
+        samples.append((perf_counter() - t0) * 1000)
+    return summarize(samples, perf_counter() - start)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(name: str, results: Dict, output: Optional[str]):
+    report = {"benchmark": name, "revision": git_revision(), "python": sys.version.split()[0], "results": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        Path(output).write_text(text)
+    return report
@@ -0,0 +1,32 @@
+import argparse
+import json
+from pathlib import Path
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_per_s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports, e.g. from two commits")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    print(f"{baseline['benchmark']}: {baseline['revision']} -> {candidate['revision']}")
+
+    for name, after in candidate["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        parts = []
+        for metric in METRICS:
+            if metric not in after or metric not in before:
+                continue
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+            parts.append(f"{metric}={before[metric]:.2f}->{after[metric]:.2f} ({change:+.1f}%)")
+        print(f"  {name}: " + ", ".join(parts))
+
+
+if __name__ == "__main__":
+    main()
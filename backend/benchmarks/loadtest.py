@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+from pathlib import Path
+from time import perf_counter
+import httpx
+from benchmarks.common import make_image, summarize, write_report
+
+
+async def login(client: httpx.AsyncClient, prefix: str, email: str, password: str) -> str:
+    response = await client.post(f"{prefix}/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, total: int, concurrency: int):
+    samples = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in counter:
+            t0 = perf_counter()
+            try:
+                response = await make_request()
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            samples.append((perf_counter() - t0) * 1000)
+
+    start = perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    summary = summarize(samples, perf_counter() - start)
+    summary["errors"] = errors
+    return summary
+
+
+async def main_async(args):
+    if args.image:
+        image_bytes = Path(args.image).read_bytes()
+    else:
+        import cv2
+
+        _, encoded = cv2.imencode(".jpg", make_image(args.width, args.height))
+        image_bytes = encoded.tobytes()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        token = await login(client, args.prefix, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        scenarios = {
+            "detection_image": lambda: client.post(
+                f"{args.prefix}/detection/image",
+                files={"file": ("frame.jpg", image_bytes, "image/jpeg")},
+                params={"zone_id": args.zone_id} if args.zone_id else None
+            ),
+            "detection_history": lambda: client.get(
+                f"{args.prefix}/detection/history", params={"per_page": args.per_page}
+            ),
+            "alerts": lambda: client.get(f"{args.prefix}/alerts/", params={"per_page": args.per_page})
+        }
+
+        results = {}
+        for name in args.scenarios.split(","):
+            results[name] = await run_scenario(client, scenarios[name], args.requests, args.concurrency)
+            results[name]["concurrency"] = args.concurrency
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load generator for the detection API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--email", default="admin@ppe-system.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--scenarios", default="detection_image,detection_history,alerts")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--zone-id", type=int)
+    parser.add_argument("--image", help="JPEG to upload; a random frame is generated when omitted")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    write_report("loadtest", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
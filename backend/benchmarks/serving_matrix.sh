@@ -0,0 +1,23 @@
+#!/usr/bin/env bash
+# Measure /detection/image throughput for several worker x torch-thread layouts.
+# Usage: benchmarks/serving_matrix.sh "1x8 2x4 4x2 8x1" [extra loadtest args]
+set -euo pipefail
+
+LAYOUTS=${1:-"1x8 2x4 4x2 8x1"}
+shift || true
+OUT_DIR=${OUT_DIR:-serving_results}
+mkdir -p "$OUT_DIR"
+
+for layout in $LAYOUTS; do
+    workers=${layout%x*}
+    threads=${layout#*x}
+    echo "== workers=$workers torch_threads=$threads"
+    WEB_CONCURRENCY=$workers TORCH_NUM_THREADS=$threads \
+        gunicorn app.main:app -c gunicorn.conf.py --bind 127.0.0.1:8000 &
+    pid=$!
+    until curl -sf http://127.0.0.1:8000/health > /dev/null; do sleep 1; done
+    python -m benchmarks.loadtest --scenarios detection_image \
+        --concurrency $((workers * 2)) --output "$OUT_DIR/layout_${layout}.json" "$@"
+    kill "$pid"
+    wait "$pid" || true
+done
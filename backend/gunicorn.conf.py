@@ -0,0 +1,35 @@
+import gc
+import os
+from app.core.config import settings
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    from app.ml.detector import get_detector
+    from app.ml.runtime import configure_threads
+
+    # Keep torch/OpenMP single-threaded in the master so no thread pool exists at fork time
+    configure_threads(num_threads=1, interop_threads=1)
+    get_detector().warmup()
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.ml.runtime import configure_threads
+
+    configure_threads()
+
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
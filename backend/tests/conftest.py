@@ -0,0 +1,43 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read once at import time, so point the app at throwaway storage first
+_tmp_dir = tempfile.mkdtemp(prefix="ppe-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/test.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp_dir, "uploads"))
+os.environ.setdefault("STORAGE_BACKEND", "local")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("WRITE_BEHIND_ENABLED", "false")
+
+import pytest
+
+
+@pytest.fixture()
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture()
+def user(client):
+    from types import SimpleNamespace
+    from app.core.database import SessionLocal
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.models import User
+
+    db = SessionLocal()
+    try:
+        row = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test User", role="admin")
+        db.add(row)
+        db.commit()
+        current_user = SimpleNamespace(id=row.id, email=row.email, role=row.role, is_active=True)
+    finally:
+        db.close()
+    
+    app.dependency_overrides[get_current_user] = lambda: current_user
+    yield current_user
+    app.dependency_overrides.pop(get_current_user, None)
\ No newline at end of file
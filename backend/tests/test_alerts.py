@@ -0,0 +1,136 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Alert, Detection, Zone
+
+BULK_URL = f"{settings.API_V1_PREFIX}/alerts/bulk"
+
+
+def make_alerts(statuses, zone_id=None, alert_type=None, created_at=None) -> list:
+    db = SessionLocal()
+    try:
+        detection = Detection(zone_id=zone_id, original_image_path="original.jpg")
+        if created_at is not None:
+            detection.created_at = created_at
+        db.add(detection)
+        db.flush()
+        alerts = []
+        for status in statuses:
+            alert = Alert(
+                detection_id=detection.id,
+                alert_type=alert_type or f"type-{uuid.uuid4()}",
+                status=status
+            )
+            if created_at is not None:
+                alert.created_at = created_at
+            alerts.append(alert)
+        db.add_all(alerts)
+        db.commit()
+        return [alert.id for alert in alerts]
+    finally:
+        db.close()
+
+
+def make_zone() -> int:
+    db = SessionLocal()
+    try:
+        zone = Zone(name=f"zone-{uuid.uuid4()}")
+        db.add(zone)
+        db.commit()
+        return zone.id
+    finally:
+        db.close()
+
+
+def alert_statuses(ids) -> list:
+    db = SessionLocal()
+    try:
+        statuses = dict(db.query(Alert.id, Alert.status).filter(Alert.id.in_(ids)).all())
+        return [statuses[i] for i in ids]
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("action, body", [
+    ("acknowledge", {}),
+    ("resolve", {}),
+    ("resolve", {"resolution_note": "note only"}),
+])
+def test_bulk_update_without_filter_is_rejected(client, user, action, body):
+    ids = make_alerts(["new"])
+    
+    response = client.post(f"{BULK_URL}/{action}", json=body)
+    
+    assert response.status_code == 400
+    assert alert_statuses(ids) == ["new"]
+
+
+@pytest.mark.parametrize("action", ["acknowledge", "resolve"])
+def test_bulk_update_with_empty_ids_is_rejected(client, user, action):
+    ids = make_alerts(["new"])
+    
+    response = client.post(f"{BULK_URL}/{action}", json={"ids": []})
+    
+    assert response.status_code == 422
+    assert alert_statuses(ids) == ["new"]
+
+
+def test_bulk_update_with_empty_alert_type_matches_nothing(client, user):
+    ids = make_alerts(["new"])
+    
+    response = client.post(f"{BULK_URL}/acknowledge", json={"alert_type": ""})
+    
+    assert response.status_code == 200
+    assert response.json() == {"updated": 0}
+    assert alert_statuses(ids) == ["new"]
+
+
+def test_bulk_acknowledge_by_ids_only_touches_new_alerts(client, user):
+    ids = make_alerts(["new", "new", "acknowledged", "resolved"])
+    untouched = make_alerts(["new"])
+    
+    response = client.post(f"{BULK_URL}/acknowledge", json={"ids": ids})
+    
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+    assert alert_statuses(ids) == ["acknowledged", "acknowledged", "acknowledged", "resolved"]
+    assert alert_statuses(untouched) == ["new"]
+
+
+def test_bulk_resolve_by_zone_skips_resolved_alerts(client, user):
+    zone_id, other_zone_id = make_zone(), make_zone()
+    ids = make_alerts(["new", "acknowledged", "resolved"], zone_id=zone_id)
+    other_ids = make_alerts(["new"], zone_id=other_zone_id)
+    
+    response = client.post(f"{BULK_URL}/resolve", json={"zone_id": zone_id, "resolution_note": "fixed"})
+    
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+    assert alert_statuses(ids) == ["resolved", "resolved", "resolved"]
+    assert alert_statuses(other_ids) == ["new"]
+    db = SessionLocal()
+    try:
+        notes = {a.resolution_note for a in db.query(Alert).filter(Alert.id.in_(ids[:2]))}
+    finally:
+        db.close()
+    assert notes == {"fixed"}
+
+
+def test_bulk_acknowledge_by_time_range(client, user):
+    alert_type = f"type-{uuid.uuid4()}"
+    start = datetime(2024, 1, 1)
+    inside = make_alerts(["new", "new"], alert_type=alert_type, created_at=start + timedelta(hours=1))
+    outside = make_alerts(["new"], alert_type=alert_type, created_at=start + timedelta(days=2))
+    
+    response = client.post(f"{BULK_URL}/acknowledge", json={
+        "alert_type": alert_type,
+        "created_from": start.isoformat(),
+        "created_to": (start + timedelta(days=1)).isoformat()
+    })
+    
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+    assert alert_statuses(inside) == ["acknowledged", "acknowledged"]
+    assert alert_statuses(outside) == ["new"]
\ No newline at end of file
@@ -0,0 +1,155 @@
+import base64
+import uuid
+import msgpack
+import orjson
+import pytest
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.storage import get_storage
+from app.models import Detection, DetectionObject
+
+INGEST_URL = f"{settings.API_V1_PREFIX}/detection/ingest"
+
+THUMBNAIL_BYTES = b"\xff\xd8\xff\xe0thumbnail"
+
+
+def make_record(**overrides) -> dict:
+    record = {
+        "camera_id": f"cam-{uuid.uuid4()}",
+        "captured_at": "2024-03-01T08:00:00+00:00",
+        "objects": [
+            {"class_id": 5, "confidence": 0.9, "bbox": [10, 10, 50, 80]},
+            {"class_id": 2, "confidence": 0.8, "bbox": [15, 5, 40, 20]}
+        ],
+        "processing_time_ms": 12.5
+    }
+    record.update(overrides)
+    return record
+
+
+def ndjson(records) -> bytes:
+    return b"\n".join(orjson.dumps(r) for r in records) + b"\n"
+
+
+def post_ndjson(client, records):
+    return client.post(INGEST_URL, content=ndjson(records), headers={"Content-Type": "application/x-ndjson"})
+
+
+def stored_detections(ids) -> list:
+    db = SessionLocal()
+    try:
+        rows = {d.id: d for d in db.query(Detection).filter(Detection.id.in_(ids))}
+        return [rows[i] for i in ids]
+    finally:
+        db.close()
+
+
+def test_ingest_ndjson(client, user):
+    thumbnail = base64.b64encode(THUMBNAIL_BYTES).decode()
+    records = [make_record(), make_record(thumbnail=thumbnail)]
+    
+    response = post_ndjson(client, records)
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 2
+    assert body["ids"] == sorted(body["ids"])
+    first, second = stored_detections(body["ids"])
+    assert [first.camera_id, second.camera_id] == [r["camera_id"] for r in records]
+    assert first.user_id == user.id
+    assert first.person_count == 1
+    assert first.violations == ["no_hardhat"]
+    assert first.original_image_path is None
+    assert get_storage().read_sync(second.original_image_path) == THUMBNAIL_BYTES
+    db = SessionLocal()
+    try:
+        objects = db.query(DetectionObject).filter(DetectionObject.detection_id == first.id).count()
+    finally:
+        db.close()
+    assert objects == 2
+
+
+def test_ingest_msgpack(client, user):
+    records = [make_record(), make_record(objects=[])]
+    
+    response = client.post(
+        INGEST_URL,
+        content=msgpack.packb(records),
+        headers={"Content-Type": "application/msgpack"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 2
+    detections = stored_detections(response.json()["ids"])
+    assert [d.camera_id for d in detections] == [r["camera_id"] for r in records]
+
+
+def test_ingest_rejects_large_content_length(client, user, monkeypatch):
+    body = ndjson([make_record()])
+    monkeypatch.setattr(settings, "INGEST_MAX_BYTES", len(body) - 1)
+    
+    response = client.post(INGEST_URL, content=body, headers={"Content-Type": "application/x-ndjson"})
+    
+    assert response.status_code == 413
+
+
+def test_ingest_rejects_large_streamed_body(client, user, monkeypatch):
+    body = ndjson([make_record() for _ in range(4)])
+    monkeypatch.setattr(settings, "INGEST_MAX_BYTES", len(body) // 2)
+    
+    def chunks():
+        # a generator body is sent chunked, without a Content-Length header
+        for i in range(0, len(body), 64):
+            yield body[i:i + 64]
+    
+    response = client.post(INGEST_URL, content=chunks(), headers={"Content-Type": "application/x-ndjson"})
+    
+    assert response.status_code == 413
+
+
+def test_ingest_rejects_unsupported_media_type(client, user):
+    response = client.post(INGEST_URL, content=ndjson([make_record()]), headers={"Content-Type": "text/plain"})
+    
+    assert response.status_code == 415
+
+
+def test_ingest_rejects_unparseable_body(client, user):
+    response = client.post(INGEST_URL, content=b"{not json\n", headers={"Content-Type": "application/x-ndjson"})
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("record", [
+    {"camera_id": "cam-missing-time", "objects": []},
+    make_record(objects=[{"class_id": 40000, "confidence": 0.9, "bbox": [0, 0, 1, 1]}]),
+    make_record(objects=[{"class_id": 0, "confidence": 0.9, "bbox": [0, 0, 1]}]),
+    make_record(thumbnail="not base64!"),
+])
+def test_ingest_rejects_malformed_records(client, user, record):
+    camera_id = make_record()["camera_id"]
+    
+    response = post_ndjson(client, [make_record(camera_id=camera_id), record])
+    
+    assert response.status_code == 422
+    assert all(err["loc"][0] == 1 for err in response.json()["detail"])
+    db = SessionLocal()
+    try:
+        assert db.query(Detection).filter(Detection.camera_id == camera_id).count() == 0
+    finally:
+        db.close()
+
+
+def test_ingest_rejects_unknown_zone(client, user):
+    camera_id = make_record()["camera_id"]
+    
+    response = post_ndjson(client, [make_record(camera_id=camera_id), make_record(zone_id=999999)])
+    
+    assert response.status_code == 422
+    assert response.json()["detail"] == [
+        {"loc": [1, "zone_id"], "msg": "ไม่พบโซน 999999", "type": "unknown_zone"}
+    ]
+    db = SessionLocal()
+    try:
+        assert db.query(Detection).filter(Detection.camera_id == camera_id).count() == 0
+    finally:
+        db.close()
\ No newline at end of file
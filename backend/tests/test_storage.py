@@ -0,0 +1,170 @@
+import asyncio
+import os
+import uuid
+import pytest
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.storage import LocalStorage, S3Storage, get_storage, parse_range
+from app.models import Detection
+
+IMAGE_BYTES = bytes(range(256)) * 8
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.fixture()
+def local_storage(tmp_path):
+    return LocalStorage(str(tmp_path / "uploads"))
+
+
+def test_local_storage_round_trip(local_storage):
+    key = asyncio.run(local_storage.save("image.jpg", IMAGE_BYTES, "image/jpeg"))
+    
+    assert key == "image.jpg"
+    assert asyncio.run(local_storage.read(key)) == IMAGE_BYTES
+    assert local_storage.read_sync(key) == IMAGE_BYTES
+    assert asyncio.run(local_storage.size(key)) == len(IMAGE_BYTES)
+    assert local_storage.presigned_url(key) is None
+    assert local_storage.content_type(key) == "image/jpeg"
+
+
+def test_local_storage_stream_ranges(local_storage):
+    asyncio.run(local_storage.save("image.jpg", IMAGE_BYTES))
+    local_storage.chunk_size = 100
+    
+    assert asyncio.run(collect(local_storage.stream("image.jpg"))) == IMAGE_BYTES
+    assert asyncio.run(collect(local_storage.stream("image.jpg", 10, 509))) == IMAGE_BYTES[10:510]
+    assert asyncio.run(collect(local_storage.stream("image.jpg", 2000))) == IMAGE_BYTES[2000:]
+
+
+def test_local_storage_legacy_relative_path(local_storage, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "legacy.jpg").write_bytes(IMAGE_BYTES)
+    
+    assert local_storage.read_sync("legacy.jpg") == IMAGE_BYTES
+
+
+def test_local_storage_missing_key(local_storage):
+    with pytest.raises(FileNotFoundError):
+        local_storage.read_sync("missing.jpg")
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(local_storage.size("missing.jpg"))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=999-999", (999, 999)),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [None, "", "items=0-10", "bytes=0-10,20-30", "bytes=-10, 50-"])
+def test_parse_range_ignored(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=1500-1600", "bytes=-0", "bytes=50-10", "bytes=a-10", "bytes=0-b"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1000)
+
+
+@pytest.fixture()
+def stored_detection(client):
+    key = f"result_{uuid.uuid4()}.jpg"
+    asyncio.run(get_storage().save(key, IMAGE_BYTES, "image/jpeg"))
+    db = SessionLocal()
+    try:
+        detection = Detection(original_image_path=key, result_image_path=key)
+        db.add(detection)
+        db.commit()
+        return detection.id
+    finally:
+        db.close()
+
+
+def test_result_image_full(client, stored_detection):
+    response = client.get(f"{settings.API_V1_PREFIX}/detection/{stored_detection}/image/result")
+    
+    assert response.status_code == 200
+    assert response.content == IMAGE_BYTES
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=2000-", 2000, 2047),
+    ("bytes=-48", 2000, 2047),
+])
+def test_result_image_range(client, stored_detection, header, start, end):
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/detection/{stored_detection}/image/result",
+        headers={"Range": header}
+    )
+    
+    assert response.status_code == 206
+    assert response.content == IMAGE_BYTES[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(IMAGE_BYTES)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+    assert "content-encoding" not in response.headers
+
+
+def test_result_image_unsatisfiable_range(client, stored_detection):
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/detection/{stored_detection}/image/result",
+        headers={"Range": f"bytes={len(IMAGE_BYTES)}-"}
+    )
+    
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(IMAGE_BYTES)}"
+
+
+def test_result_image_multi_range_returns_full_body(client, stored_detection):
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/detection/{stored_detection}/image/result",
+        headers={"Range": "bytes=0-9,20-29"}
+    )
+    
+    assert response.status_code == 200
+    assert response.content == IMAGE_BYTES
+
+
+def test_result_image_missing(client):
+    response = client.get(f"{settings.API_V1_PREFIX}/detection/999999/image/result")
+    
+    assert response.status_code == 404
+
+
+@pytest.mark.skipif(
+    not os.environ.get("S3_TEST_ENDPOINT_URL"),
+    reason="set S3_TEST_ENDPOINT_URL to run against MinIO (docker compose up minio)"
+)
+def test_s3_storage_against_minio():
+    storage = S3Storage(
+        bucket=os.environ.get("S3_TEST_BUCKET", "ppe-detection-test"),
+        endpoint_url=os.environ["S3_TEST_ENDPOINT_URL"],
+        access_key=os.environ.get("S3_TEST_ACCESS_KEY", "minioadmin"),
+        secret_key=os.environ.get("S3_TEST_SECRET_KEY", "minioadmin"),
+        region="us-east-1"
+    )
+    storage.ensure_bucket()
+    key = f"test_{uuid.uuid4()}.jpg"
+    
+    assert asyncio.run(storage.save(key, IMAGE_BYTES, "image/jpeg")) == key
+    assert asyncio.run(storage.read(key)) == IMAGE_BYTES
+    assert storage.read_sync(key) == IMAGE_BYTES
+    assert asyncio.run(storage.size(key)) == len(IMAGE_BYTES)
+    assert asyncio.run(collect(storage.stream(key, 10, 509))) == IMAGE_BYTES[10:510]
+    if settings.S3_PRESIGNED_REDIRECT:
+        assert key in storage.presigned_url(key)
+    with pytest.raises(FileNotFoundError):
+        storage.read_sync(f"missing_{uuid.uuid4()}.jpg")
\ No newline at end of file
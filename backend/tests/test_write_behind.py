@@ -0,0 +1,88 @@
+import uuid
+import pytest
+from app.core.database import SessionLocal
+from app.models import Detection
+from app.services.write_behind import WriteBehindBuffer
+
+
+def make_record(camera_id: str, detected_objects=None) -> dict:
+    return {
+        "camera_id": camera_id,
+        "zone_id": None,
+        "original_image_path": "original.jpg",
+        "result_image_path": "result.jpg",
+        "detected_objects": detected_objects or [],
+        "violations": [],
+        "person_count": 0,
+        "violation_count": 0,
+        "has_violation": False,
+        "processing_time_ms": 1.0
+    }
+
+
+def stored_ids(camera_ids) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.query(Detection.id, Detection.camera_id).filter(Detection.camera_id.in_(camera_ids)).all()
+        return {row.camera_id: row.id for row in rows}
+    finally:
+        db.close()
+
+
+@pytest.fixture()
+def buffer(client):
+    buffer = WriteBehindBuffer(max_rows=10, flush_ms=20)
+    yield buffer
+    buffer.stop()
+
+
+def test_batch_flush_returns_ids_in_submission_order(buffer):
+    camera_ids = [f"cam-{uuid.uuid4()}" for _ in range(5)]
+    buffer.start()
+    futures = [buffer.submit(make_record(camera_id)) for camera_id in camera_ids]
+    
+    ids = [future.result(timeout=5) for future in futures]
+    
+    assert ids == sorted(ids)
+    assert stored_ids(camera_ids) == dict(zip(camera_ids, ids))
+
+
+def test_cancelled_future_is_not_inserted(buffer):
+    cancelled_camera, kept_camera = f"cam-{uuid.uuid4()}", f"cam-{uuid.uuid4()}"
+    cancelled = buffer.submit(make_record(cancelled_camera))
+    kept = buffer.submit(make_record(kept_camera))
+    assert cancelled.cancel()
+    
+    buffer._flush(buffer._next_batch())
+    
+    assert stored_ids([cancelled_camera, kept_camera]) == {kept_camera: kept.result(timeout=0)}
+
+
+def test_bad_record_does_not_lose_the_rest_of_the_batch(buffer):
+    good_cameras = [f"cam-{uuid.uuid4()}" for _ in range(2)]
+    bad_camera = f"cam-{uuid.uuid4()}"
+    good_first = buffer.submit(make_record(good_cameras[0]))
+    # objects without a bbox make the detection_objects insert fail
+    bad = buffer.submit(make_record(bad_camera, detected_objects=[{"class_id": 0}]))
+    good_last = buffer.submit(make_record(good_cameras[1]))
+    
+    buffer._flush(buffer._next_batch())
+    
+    with pytest.raises(KeyError):
+        bad.result(timeout=0)
+    stored = stored_ids(good_cameras + [bad_camera])
+    assert stored == {good_cameras[0]: good_first.result(timeout=0), good_cameras[1]: good_last.result(timeout=0)}
+
+
+def test_stop_flushes_pending_records(client):
+    buffer = WriteBehindBuffer(max_rows=100, flush_ms=60000)
+    camera_ids = [f"cam-{uuid.uuid4()}" for _ in range(3)]
+    buffer.start()
+    futures = [buffer.submit(make_record(camera_id)) for camera_id in camera_ids]
+    
+    buffer.stop()
+    
+    assert all(future.done() for future in futures)
+    assert stored_ids(camera_ids) == {c: f.result() for c, f in zip(camera_ids, futures)}
+    with pytest.raises(RuntimeError):
+        buffer.submit(make_record(f"cam-{uuid.uuid4()}"))
\ No newline at end of file